@@ -34,16 +34,18 @@ if __name__ == '__main__':
         fromSettings = bool(args and args[0] == 'from.settings')
         preshowutil.loadContent(from_settings=fromSettings, bg=not fromSettings)
         if fromSettings:
-            kodiutil.ADDON.openSettings()
+            kodiutil.openSettings()
     elif arg == 'feature.setRatingBumperStyle':
         preshowutil.setRatingBumperStyle()
     elif arg == 'pastebin.paste.log':
         settings.pasteLog()
-        kodiutil.ADDON.openSettings()
+        kodiutil.openSettings()
     elif arg == 'pastebin.delete.key':
         settings.deleteUserKey()
     elif arg == 'reset.database':
         settings.removeContentDatabase()
+    elif arg == 'maintain.database':
+        preshowutil.maintainDatabase()
     elif arg == 'trailer.scrapers':
         settings.setScrapers()
     elif arg == 'test.actions':
@@ -1,8 +1,10 @@
 import json
 import os
 import re
+import math
 import time
 import threading
+import collections
 import xbmc
 import xbmcgui
 import xbmcvfs
@@ -126,24 +128,131 @@ def getIMDBAspectRatio(title, imdb_number=None):
 
     return '1.85'  # Fallback aspect ratio if not found or no aspect ratios are listed
     
+class PlaybackSignal:
+    """
+    Lets playback threads sleep until something they are waiting on may have changed.
+
+    Player callbacks, window actions, queued steps and fades call notify(). Kodi only delivers player and
+    monitor callbacks while the thread that created them is in a Kodi wait, so waiters sleep in
+    Monitor.waitForAbort() slices of POLL_INTERVAL. They return once notified, at their own deadline, or
+    after CHECK_INTERVAL to look at state Kodi only exposes by polling.
+    """
+    CHECK_INTERVAL = 1.0
+    POLL_INTERVAL = 0.1
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._count = 0
+        self._seen = threading.local()
+        self._monitor = xbmc.Monitor()
+
+    def notify(self):
+        with self._lock:
+            self._count += 1
+
+    def wait(self, timeout=CHECK_INTERVAL):
+        """
+        Waits up to timeout seconds (at most CHECK_INTERVAL) for notify(). Returns at once if notify() was
+        called since this thread last woke. Returns True if Kodi is exiting.
+        """
+        seen = getattr(self._seen, 'count', self._count)
+        end = time.time() + max(0, min(timeout, self.CHECK_INTERVAL))
+        try:
+            while self._count == seen:
+                remaining = end - time.time()
+                if remaining <= 0:
+                    break
+                if self._monitor.waitForAbort(min(remaining, self.POLL_INTERVAL)):
+                    return True
+        finally:
+            self._seen.count = self._count
+
+        return self._monitor.abortRequested()
+
+    def waitUntil(self, *deadlines):
+        """
+        Waits for notify() or the earliest of the given times, ignoring empty ones. Returns True if Kodi is exiting.
+        """
+        deadlines = [d for d in deadlines if d]
+        return self.wait(deadlines and min(deadlines) - time.time() or self.CHECK_INTERVAL)
+
+
+def notifies(func):
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            if getattr(self, 'signal', None):
+                self.signal.notify()
+
+    return wrapper
+
+
+def _fadeCurve(name, points=64):
+    if name == 'log':
+        shape = lambda x: math.log10(1 + 9 * x)
+    elif name == 's':
+        shape = lambda x: x * x * (3 - 2 * x)
+    else:
+        shape = lambda x: x
+    return [shape(i / float(points)) for i in range(points + 1)]
+
+
+FADE_CURVES = dict((name, _fadeCurve(name)) for name in ('linear', 'log', 's'))
+
+
+class VolumeFade:
+    def __init__(self, start, end, fade_time_millis, curve='linear'):
+        self.start = start
+        self.end = end
+        self.duration = max(fade_time_millis / 1000.0, 0.001)
+        self.startTime = time.time()
+        self.curve = FADE_CURVES.get(curve, FADE_CURVES['linear'])
+        self.interval = max(KodiVolumeControl.MIN_INTERVAL, self.duration / max(1, abs(end - start)))
+
+    @property
+    def endTime(self):
+        return self.startTime + self.duration
+
+    def volumeAt(self, now):
+        pos = min(max((now - self.startTime) / self.duration, 0.0), 1.0) * (len(self.curve) - 1)
+        i = int(pos)
+        frac = self.curve[i]
+        if i < len(self.curve) - 1:
+            frac += (self.curve[i + 1] - frac) * (pos - i)
+        return int(round(self.start + (self.end - self.start) * frac))
+
+
 class KodiVolumeControl:
-    def __init__(self, abort_flag):
+    """
+    Sets Kodi's volume and runs fades on one long-lived thread.
+
+    A new fade replaces the running one and starts from the volume it had reached. SetVolume is only sent
+    when the volume changes, at most every MIN_INTERVAL seconds. Fades hold while playback is paused.
+    """
+    MIN_INTERVAL = 0.05
+    PLAYING_CHECK = 0.5
+
+    def __init__(self, abort_flag, signal):
         self.saved = None
         self.abortFlag = abort_flag
-        self._stopFlag = False
-        self._fader = None
+        self.signal = signal
         self._restoring = False
+        self._volume = None
+        self._condition = threading.Condition()
+        self._fade = None
+        self._pausedAt = None
+        self._closed = False
+        self._thread = None
 
     def current(self):
         return rpc.Application.GetProperties(properties=['volume'])['volume']
 
     def fading(self):
-        if not self._fader:
-            return False
-
-        return self._fader.is_alive()
+        return self._fade is not None
 
     def _set(self, volume):
+        self._volume = volume
         xbmc.executebuiltin("SetVolume({0})".format(volume))
 
     def store(self):
@@ -164,6 +273,8 @@ class KodiVolumeControl:
             if delay:
                 xbmc.sleep(delay)
 
+            self.stop()
+
             DEBUG_LOG('Restoring volume to: {0}'.format(self.saved))
 
             self._set(self.saved)
@@ -171,7 +282,7 @@ class KodiVolumeControl:
         finally:
             self._restoring = False
 
-    def set(self, volume_or_pct, fade_time=0, relative=False):
+    def set(self, volume_or_pct, fade_time=0, relative=False, curve='linear'):
         self.store()
         if relative:
             volume = int(self.saved * (volume_or_pct / 100.0))
@@ -181,54 +292,96 @@ class KodiVolumeControl:
             DEBUG_LOG('Setting volume to: {0}'.format(volume))
 
         if fade_time:
-            current = self.current()
-            self._fade(current, volume, fade_time)
+            self.fadeTo(volume, fade_time, curve)
         else:
+            self.stop()
             self._set(volume)
 
+    def fadeTo(self, volume, fade_time_millis, curve='linear'):
+        with self._condition:
+            start = self._fade and self._fade.volumeAt(time.time())
+            if start is None:
+                start = self.current()
+
+            DEBUG_LOG('Fade: START ({0} -> {1}) - {2}ms'.format(start, volume, fade_time_millis))
+            self._fade = VolumeFade(start, volume, fade_time_millis, curve)
+            self._pausedAt = None
+            self._closed = False
+            self._condition.notify_all()
+
+        if not self._thread or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='PreShowVolumeFade')
+            self._thread.daemon = True
+            self._thread.start()
+
+    @notifies
     def stop(self):
-        self._stopFlag = True
+        with self._condition:
+            if self._fade:
+                DEBUG_LOG('Fade: STOPPED')
+            self._fade = None
+            self._condition.notify_all()
 
-    def _stop(self):
-        if self._stopFlag:
-            self._stopFlag = False
-            return True
-        return False
+    def pause(self):
+        with self._condition:
+            if self._fade and self._pausedAt is None:
+                self._pausedAt = time.time()
 
-    def _fade(self, start, end, fade_time_millis):
-        if self.fading():
-            self.stop()
-            self._fader.join()
-        self._fader = threading.Thread(target=self._fadeWorker, args=(start, end, fade_time_millis))
-        self._fader.start()
-
-    def _fadeWorker(self, start, end, fade_time_millis):
-        volWidth = end - start
-
-        func = end > start and min or max
-
-        duration = fade_time_millis / 1000.0
-        endTime = time.time() + duration
-        vol = start
-        left = duration
-
-        DEBUG_LOG('Fade: START ({0}) - {1}ms'.format(start, fade_time_millis))
-        while time.time() < endTime and not kodiutil.wait(0.1):
-            while xbmc.getCondVisibility('Player.Paused') and not kodiutil.wait(0.1):
-                endTime = time.time() + left
-
-            if xbmc.Monitor().abortRequested() or not xbmc.getCondVisibility(
-                    'Player.Playing') or self.abortFlag.is_set() or self._stop():
-                DEBUG_LOG(
-                    'Fade ended early({0}): {1}'.format(vol, not xbmc.getCondVisibility(
-                        'Player.Playing') and 'NOT_PLAYING' or 'ABORT')
-                )
+    def resume(self):
+        with self._condition:
+            if self._fade and self._pausedAt is not None:
+                self._fade.startTime += time.time() - self._pausedAt
+                self._condition.notify_all()
+            self._pausedAt = None
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._fade = None
+            self._condition.notify_all()
+
+    def _finish(self, fade, msg):
+        with self._condition:
+            if self._fade is not fade:
                 return
-            left = endTime - time.time()
-            vol = func(end, int(start + (((duration - left) / duration) * volWidth)))
-            self._set(vol)
+            self._fade = None
+
+        DEBUG_LOG('Fade: {0} ({1})'.format(msg, self._volume))
+        self.signal.notify()
+
+    def _run(self):
+        checked = 0
+        while True:
+            with self._condition:
+                while not self._closed and (not self._fade or self._pausedAt is not None):
+                    self._condition.wait()
+                if self._closed:
+                    return
+                fade = self._fade
+
+            now = time.time()
+            if self.abortFlag.is_set() or xbmc.Monitor().abortRequested():
+                self._finish(fade, 'ENDED EARLY - ABORT')
+                continue
+
+            if now - checked >= self.PLAYING_CHECK:
+                checked = now
+                if not xbmc.getCondVisibility('Player.Playing'):
+                    self._finish(fade, 'ENDED EARLY - NOT_PLAYING')
+                    continue
+
+            volume = fade.volumeAt(now)
+            if volume != self._volume:
+                self._set(volume)
+
+            if now >= fade.endTime:
+                self._finish(fade, 'END')
+                continue
+
+            with self._condition:
+                if self._fade is fade and not self._closed:
+                    self._condition.wait(min(fade.interval, fade.endTime - now))
 
-        DEBUG_LOG('Fade: END ({0})'.format(vol))
 
 class SettingControl:
     def __init__(self, setting, log_display, disable_value=''):
@@ -270,6 +423,7 @@ class ExperienceWindow(kodigui.BaseWindow):
         self.action = None
         self.volume = None
         self.abortFlag = None
+        self.signal = None
         self.effect = None
         self.duration = 400
         self.lastImage = ''
@@ -408,6 +562,9 @@ class ExperienceWindow(kodigui.BaseWindow):
         except:
             kodiutil.ERROR()
             return kodigui.BaseWindow.onAction(self, action)
+        finally:
+            if self.signal:
+                self.signal.notify()
 
         kodigui.BaseWindow.onAction(self, action)
         
@@ -532,6 +689,8 @@ class ExperiencePlayer(xbmc.Player):
     PLAYING_MUSIC = -10
     MUSIC_STOPPED = -20
 
+    STEP_INTERVAL = 0.1
+
     DUMMY_FILE_PREV = 'dummy_PREV.mp4'
     DUMMY_FILE_NEXT = 'dummy_NEXT.mp4'
 
@@ -557,6 +716,7 @@ class ExperiencePlayer(xbmc.Player):
 
     # PLAYER EVENTS
     @requiresStart
+    @notifies
     def onPlayBackEnded(self):
         if self.playStatus != self.PLAYING_MUSIC:
             self.volume.restore()
@@ -579,8 +739,10 @@ class ExperiencePlayer(xbmc.Player):
         self.next()
 
     @requiresStart
+    @notifies
     def onPlayBackPaused(self):       
         DEBUG_LOG('PLAYBACK PAUSED')
+        self.volume.pause()
         if self.pauseAction:
             DEBUG_LOG('Executing pause action: {0}'.format(self.pauseAction))
             self.pauseAction.run()
@@ -590,8 +752,10 @@ class ExperiencePlayer(xbmc.Player):
             DEBUG_LOG("Chapter tracking paused.")          
             
     @requiresStart
+    @notifies
     def onPlayBackResumed(self):
         DEBUG_LOG("Playback Resumed.")       
+        self.volume.resume()
         if self.resumeAction is True:
             resumeAction = self.processor.lastAction()
             if resumeAction:
@@ -651,6 +815,7 @@ class ExperiencePlayer(xbmc.Player):
     
         
     @requiresStart
+    @notifies
     def onPlayBackStarted(self):
         if self.is_feature_playing:
             xbmc.sleep(3000)
@@ -695,7 +860,12 @@ class ExperiencePlayer(xbmc.Player):
         # Log that playback has started
         DEBUG_LOG('PLAYBACK STARTED')
 
+    @notifies
+    def onAVStarted(self):
+        pass
+
     @requiresStart
+    @notifies
     def onPlayBackStopped(self):
         self.is_tracking_chapters = False
         self.is_feature_playing = False
@@ -725,6 +895,7 @@ class ExperiencePlayer(xbmc.Player):
         self.abort()
 
     @requiresStart
+    @notifies
     def onPlayBackFailed(self):
         self.setPlayStatus(self.NOT_PLAYING)
         DEBUG_LOG('PLAYBACK FAILED')
@@ -747,8 +918,11 @@ class ExperiencePlayer(xbmc.Player):
 
     def init(self):
         self.abortFlag = threading.Event()
+        self.signal = PlaybackSignal()
         self.window = None
-        self.volume = KodiVolumeControl(self.abortFlag)
+        self._steps = collections.deque()
+        self._stepLock = threading.Lock()
+        self.volume = KodiVolumeControl(self.abortFlag, self.signal)
         self.screensaver = SettingControl('screensaver.mode', 'Screensaver')
         self.visualization = SettingControl('musicplayer.visualisation', 'Visualization')
         self.playGUISounds = SettingControl('audiooutput.guisoundmode', 'Play GUI sounds', disable_value=0)
@@ -927,13 +1101,18 @@ class ExperiencePlayer(xbmc.Player):
 
         try:
             details = rpc.VideoLibrary.GetMovieSetDetails(setid=DBID)
-            for m in details['setdetails']['movies']:
-                try:
-                    r = rpc.VideoLibrary.GetMovieDetails(
+            with rpc.batch() as batch:
+                calls = [
+                    batch.VideoLibrary.GetMovieDetails(
                         movieid=m['movieid'],
                         properties=['file', 'genre', 'tag', 'mpaa', 'streamdetails', 'title', 'thumbnail', 'runtime',
                                     'year', 'studio', 'director', 'cast']
-                    )['moviedetails']
+                    ) for m in details['setdetails']['movies']
+                ]
+
+            for call in calls:
+                try:
+                    r = call.get()['moviedetails']
                     feature = self.featureFromJSON(r)
                     self.features.append(feature)
                 except:
@@ -978,34 +1157,36 @@ class ExperiencePlayer(xbmc.Player):
         return True
 
     def featureFromId(self, movieid=None, episodeid=None):
-        if movieid:
-            for movieid in str(movieid).split('|'):  # ID could be int or \ seperated int string
-                movieid = kodiutil.intOrZero(movieid)
-                if not movieid:
-                    continue
+        calls = []
+        with rpc.batch() as batch:
+            if movieid:
+                for movieid in str(movieid).split('|'):  # ID could be int or \ seperated int string
+                    movieid = kodiutil.intOrZero(movieid)
+                    if not movieid:
+                        continue
 
-                r = rpc.VideoLibrary.GetMovieDetails(
-                    movieid=movieid,
-                    properties=['file', 'genre', 'tag', 'mpaa', 'streamdetails', 'title', 'thumbnail', 'runtime',
-                                'year', 'studio', 'director', 'cast']
-                )['moviedetails']
-                r['type'] = 'movie'
-
-                feature = self.featureFromJSON(r)
-                self.features.append(feature)
-        elif episodeid:
-            for episodeid in str(episodeid).split('|'):  # ID could be int or \ seperated int string
-                episodeid = kodiutil.intOrZero(episodeid)
-                if not episodeid:
-                    continue
+                    calls.append(('movie', batch.VideoLibrary.GetMovieDetails(
+                        movieid=movieid,
+                        properties=['file', 'genre', 'tag', 'mpaa', 'streamdetails', 'title', 'thumbnail', 'runtime',
+                                    'year', 'studio', 'director', 'cast']
+                    )))
+            elif episodeid:
+                for episodeid in str(episodeid).split('|'):  # ID could be int or \ seperated int string
+                    episodeid = kodiutil.intOrZero(episodeid)
+                    if not episodeid:
+                        continue
+
+                    calls.append(('tvshow', batch.VideoLibrary.GetEpisodeDetails(
+                        episodeid=episodeid,
+                        properties=['file', 'streamdetails', 'title', 'thumbnail', 'runtime']
+                    )))
 
-                r = rpc.VideoLibrary.GetEpisodeDetails(
-                    episodeid=episodeid,
-                    properties=['file', 'streamdetails', 'title', 'thumbnail', 'runtime']
-                )['episodedetails']
-                r['type'] = 'tvshow'
-                feature = self.featureFromJSON(r)
-                self.features.append(feature)
+        for dbType, call in calls:
+            r = call.get()[dbType == 'movie' and 'moviedetails' or 'episodedetails']
+            r['type'] = dbType
+
+            feature = self.featureFromJSON(r)
+            self.features.append(feature)
 
         return None
 
@@ -1133,10 +1314,12 @@ class ExperiencePlayer(xbmc.Player):
             self.volume.set(volume, relative=True)
         
         if features:
-            rpc.Playlist.Add(playlistid=xbmc.PLAYLIST_VIDEO, item={'file': self.fakeFilePrev})
-            for feature in features:
-                self.addFeatureToPlaylist(feature)
-            rpc.Playlist.Add(playlistid=xbmc.PLAYLIST_VIDEO, item={'file': self.fakeFileNext})
+            with rpc.batch() as batch:
+                batch.Playlist.Add(playlistid=xbmc.PLAYLIST_VIDEO, item={'file': self.fakeFilePrev})
+                for feature in features:
+                    self.addFeatureToPlaylist(feature, batch)
+                batch.Playlist.Add(playlistid=xbmc.PLAYLIST_VIDEO, item={'file': self.fakeFileNext})
+            batch.check()
             self.is_feature_playing = True
         else:
             for video in videos:
@@ -1154,18 +1337,18 @@ class ExperiencePlayer(xbmc.Player):
         while not xbmc.getCondVisibility(
                 'VideoPlayer.IsFullscreen') and not xbmc.Monitor().abortRequested() and not self.abortFlag.is_set() and self.isPlaying():
             xbmc.executebuiltin('ActivateWindow(fullscreenvideo)')
-            xbmc.sleep(100)
+            self.signal.wait(0.1)  # Fullscreen has no event, but player callbacks still end this early
         self.hasFullscreened = True
         DEBUG_LOG('VIDEO HAS GONE FULLSCREEN')
 
-    def addFeatureToPlaylist(self, feature):
+    def addFeatureToPlaylist(self, feature, batch=None):
         if feature.dbType == 'movie':
             item = {'movieid': feature.ID}
         elif feature.dbType == 'tvshow':
             item = {'episodeid': feature.ID}
         else:
             item = {'file': feature.path}
-        rpc.Playlist.Add(playlistid=xbmc.PLAYLIST_VIDEO, item=item)
+        (batch or rpc).Playlist.Add(playlistid=xbmc.PLAYLIST_VIDEO, item=item)
 
     def videoPreDelay(self):
         delay = kodiutil.getSetting('video.preDelay', 0)
@@ -1215,6 +1398,9 @@ class ExperiencePlayer(xbmc.Player):
         try:
             return self._start(sequence_path)
         finally:
+            if hasattr(self, 'processor'):
+                self.processor.close()
+            self.volume.close()
             self.playGUISounds.restore()
             self.screensaver.restore()
             self.visualization.restore()
@@ -1246,10 +1432,13 @@ class ExperiencePlayer(xbmc.Player):
         self.window.player = self
         self.window.volume = self.volume
         self.window.abortFlag = self.abortFlag
+        self.window.signal = self.signal
         self.window.join()
 
     def waitLoop(self):
-        while not kodiutil.wait(0.1) and self.window.isOpen:
+        while not self.waitForStep() and self.window.isOpen:
+            self.runSteps()
+
             if self.processor.atEnd():
                 break
 
@@ -1309,15 +1498,15 @@ class ExperiencePlayer(xbmc.Player):
         self.play(pl, windowed=True)
 
         self.waitForPlayStart()  # Wait playback so fade will work
-        self.volume.set(image_queue.musicVolume, fade_time=int(image_queue.musicFadeIn * 1000), relative=True)
+        self.volume.set(image_queue.musicVolume, fade_time=int(image_queue.musicFadeIn * 1000), relative=True, curve='s')
 
     def stopMusic(self, image_queue=None):
         try:
             rpc.Playlist.Clear(playlistid=xbmc.PLAYLIST_MUSIC)
 
             if image_queue and image_queue.music:
-                self.volume.set(1, fade_time=int(image_queue.musicFadeOut * 1000))
-                while self.volume.fading() and not self.abortFlag.is_set() and not kodiutil.wait(0.1):
+                self.volume.set(1, fade_time=int(image_queue.musicFadeOut * 1000), curve='s')
+                while self.volume.fading() and not self.abortFlag.is_set() and not self.signal.wait():
                     if self.window.hasAction() and self.window.action != 'RESUME':
                         break
 
@@ -1331,11 +1520,21 @@ class ExperiencePlayer(xbmc.Player):
     def waitForPlayStart(self, timeout=10000):
         giveUpTime = time.time() + timeout / 1000.0
         while not xbmc.getCondVisibility('Player.Playing') and time.time() < giveUpTime and not self.abortFlag.is_set():
-            xbmc.sleep(100)
+            if self.signal.waitUntil(giveUpTime):
+                break
 
     def waitForPlayStop(self):
         while self.isPlaying() and not self.abortFlag.is_set():
-            xbmc.sleep(100)
+            if self.signal.wait():
+                break
+
+    def waitForImage(self, *deadlines):
+        """
+        Waits for a window action or player event, or until the first of the deadlines unless paused.
+        """
+        if self.window.paused():
+            return self.signal.wait()
+        return self.signal.waitUntil(*deadlines)
 
     def showImage(self, image):
         try:
@@ -1347,7 +1546,7 @@ class ExperiencePlayer(xbmc.Player):
             stop = time.time() + image.duration
             fadeStop = image.fade and stop - (image.fade / 1000) or 0
 
-            while not kodiutil.wait(0.1) and (time.time() < stop or self.window.paused()):
+            while not self.waitForImage(stop, fadeStop) and (time.time() < stop or self.window.paused()):
                 if fadeStop and time.time() >= fadeStop and not self.window.paused():
                     fadeStop = None
                     self.window.fadeOut()
@@ -1378,7 +1577,7 @@ class ExperiencePlayer(xbmc.Player):
         self.window.setImage(image.path)
 
         stop = time.time() + image.duration
-        while not kodiutil.wait(0.1) and (time.time() < stop or self.window.paused()):
+        while not self.waitForImage(stop, info.musicEnd) and (time.time() < stop or self.window.paused()):
             if not self.window.isOpen:
                 return False
 
@@ -1508,7 +1707,50 @@ class ExperiencePlayer(xbmc.Player):
     def doGoto(self, goto):
         return goto.run()
 
+    # PLAYBACK STATE MACHINE
     def next(self, prev=False):
+        """
+        Queues a step to the next (or previous) playable. Steps are taken one at a time by runSteps() from
+        waitLoop, so player callbacks and items that move on by themselves never nest calls.
+        """
+        with self._stepLock:
+            self._steps.append(prev)
+        self.signal.notify()
+
+    def waitForStep(self, timeout=PlaybackSignal.CHECK_INTERVAL):
+        """
+        Idles until a step is queued or timeout passes. Kodi only delivers player callbacks while the thread
+        that created the player is in a Kodi wait, so this waits through Kodi in STEP_INTERVAL slices and
+        checks the queue between them. Returns True if Kodi is exiting.
+        """
+        end = time.time() + timeout
+        while not self._steps:
+            remaining = end - time.time()
+            if remaining <= 0:
+                break
+            if self.monitor.waitForAbort(min(remaining, self.STEP_INTERVAL)):
+                return True
+
+        return self.monitor.abortRequested()
+
+    def runSteps(self):
+        while True:
+            with self._stepLock:
+                if not self._steps:
+                    return
+                prev = self._steps.popleft()
+
+            start = time.time()
+            playable = self.step(prev)
+            self.onTransition(playable, prev, time.time() - start)
+
+    def onTransition(self, playable, prev, elapsed):
+        """
+        Called after each step with the playable it handled (None if it ended the show) and the seconds it took.
+        """
+        DEBUG_LOG('Step{0}: {1} ({2:.2f}s)'.format(prev and ' (prev)' or '', playable, elapsed))
+
+    def step(self, prev=False):
         if not self.processor or self.processor.atEnd():
             return
 
@@ -1593,6 +1835,9 @@ class ExperiencePlayer(xbmc.Player):
             DEBUG_LOG('NOT PLAYING: {0}'.format(playable))
             self.next()
 
+        return playable
+
+    @notifies
     def abort(self):
         self.abortFlag.set()
         DEBUG_LOG('ABORT')
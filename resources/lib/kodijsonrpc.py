@@ -36,6 +36,86 @@ class JSONRPCMethod:
         self.family = family
         return self
 
+class JSONRPCCall:
+    def __init__(self, method, params):
+        self.method = method
+        self.params = params
+        self.result = None
+        self.error = None
+
+    def get(self):
+        if self.error is not None:
+            raise JSONRPCMethod.Exception(self.error)
+        return self.result
+
+class JSONRPCBatch:
+    """
+    Collects calls and sends them to Kodi as one JSON-RPC batch (array) request.
+
+    Calls are made like rpc calls and return a JSONRPCCall, whose get() returns the result or raises
+    JSONRPCMethod.Exception once the batch is sent. Leaving a with block sends the batch, and check()
+    raises the first error in the last batch sent.
+    """
+    class Family:
+        def __init__(self, batch, family):
+            self.batch = batch
+            self.family = family
+
+        def __getattr__(self, method):
+            def handler(**kwargs):
+                call = JSONRPCCall('{0}.{1}'.format(self.family, method), kwargs)
+                self.batch.calls.append(call)
+                return call
+
+            return handler
+
+    def __init__(self):
+        self.calls = []
+        self.sent = []
+
+    def __getattr__(self, family):
+        return self.Family(self, family)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.send()
+
+    def send(self):
+        calls = self.sent = self.calls[:]
+        del self.calls[:]
+        if not calls:
+            return calls
+
+        commands = []
+        for i, call in enumerate(calls):
+            command = {'jsonrpc': '2.0', 'id': i, 'method': call.method}
+            if call.params:
+                command['params'] = call.params
+            commands.append(command)
+
+        ret = json.loads(xbmc.executeJSONRPC(json.dumps(commands)))
+        if isinstance(ret, dict):  # The whole batch was rejected
+            ret = [dict(ret, id=i) for i in range(len(calls))]
+
+        responses = dict((r.get('id'), r) for r in ret or [])
+        for i, call in enumerate(calls):
+            r = responses.get(i)
+            if r is None:
+                call.error = {'message': 'No response'}
+            elif 'error' in r:
+                call.error = r['error']
+            else:
+                call.result = r.get('result')
+
+        return calls
+
+    def check(self):
+        for call in self.sent:
+            call.get()
+
 class KodiJSONRPC:
     def __init__(self):
         self.methodHandler = JSONRPCMethod()
@@ -43,4 +123,7 @@ class KodiJSONRPC:
     def __getattr__(self, family):
         return self.methodHandler(family)
 
+    def batch(self):
+        return JSONRPCBatch()
+
 rpc = KodiJSONRPC()
@@ -80,8 +80,41 @@ def strRepr(str_obj):
     return repr(str_obj).lstrip('u').strip("'")
 
 
+# Raw setting strings for this process, cleared when Kodi reports a settings change.
+# This is the only settings cache - preshowexperience.util reads through it too.
+_SETTINGS = {}
+
+
+class SettingsMonitor(xbmc.Monitor):
+    def onSettingsChanged(self):
+        clearSettingsCache()
+
+
+def clearSettingsCache():
+    _SETTINGS.clear()
+
+
+def openSettings():
+    """
+    Opens the addon settings dialog. The monitor only hears about changes once this thread next waits
+    in Kodi, so the cache is cleared here for reads made straight after the dialog closes.
+    """
+    ADDON.openSettings()
+    clearSettingsCache()
+
+
+def getRawSetting(key):
+    if key not in _SETTINGS:
+        _SETTINGS[key] = ADDON.getSetting(key)
+    return _SETTINGS[key]
+
+
+# Created on import, i.e. on the script's main thread, which is where Kodi delivers the callback
+_SETTINGS_MONITOR = SettingsMonitor()
+
+
 def getSetting(key, default=None):
-    setting = ADDON.getSetting(key)
+    setting = getRawSetting(key)
     return _processSetting(setting, default)
 
 
@@ -113,6 +146,7 @@ def _processSetting(setting, default):
 def setSetting(key, value):
     value = _processSettingForWrite(value)
     ADDON.setSetting(key, value)
+    _SETTINGS.pop(key, None)
 
 
 def _processSettingForWrite(value):
@@ -1063,7 +1063,7 @@ class SequenceEditorWindow(kodigui.BaseWindow):
         return themes
 
     def settings(self):
-        kodiutil.ADDON.openSettings()
+        kodiutil.openSettings()
 
         kodiutil.setScope()
         preshowexperience.init(kodiutil.DEBUG())
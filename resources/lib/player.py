@@ -211,18 +211,20 @@ class PlaylistDialog(kodigui.BaseDialog):
     def apply(self):
         from .kodijsonrpc import rpc
 
-        rpc.Playlist.Clear(playlistid=xbmc.PLAYLIST_VIDEO)
-
-        for i in self.videoListControl:
-            f = i.dataSource
-            if f.dbType == 'movie':
-                item = {'movieid': f.ID}
-            elif f.dbType == 'tvshow':
-                item = {'episodeid': f.ID}
-            else:
-                item = {'file': f.path}
-
-            rpc.Playlist.Add(playlistid=xbmc.PLAYLIST_VIDEO, item=item)
+        with rpc.batch() as batch:
+            batch.Playlist.Clear(playlistid=xbmc.PLAYLIST_VIDEO)
+
+            for i in self.videoListControl:
+                f = i.dataSource
+                if f.dbType == 'movie':
+                    item = {'movieid': f.ID}
+                elif f.dbType == 'tvshow':
+                    item = {'episodeid': f.ID}
+                else:
+                    item = {'file': f.path}
+
+                batch.Playlist.Add(playlistid=xbmc.PLAYLIST_VIDEO, item=item)
+        batch.check()
 
     def selectSequence(self):
         selection = preshowutil.selectSequence(active=False, for_dialog=True)
@@ -43,6 +43,14 @@ def getBumperDir(ID):
 
     return ('Video Bumpers', dirname)
 
+def packPath(prefix):
+    # Scanner prefixes are ':' joined directory names relative to the section dir
+    return (prefix or '').replace(':', '/')
+
+def updatePack(model, row, pack):
+    if row.pack != pack:
+        model.update(pack=pack).where(model.id == row.id).execute()
+
                 
                                     
                                
@@ -115,6 +123,8 @@ class UserContent:
 
     def setupDB(self, db_path):
         DB.initialize(db_path, self.dbCallback)
+        from . import ratings
+        ratings.ensureLoaded()  # Before any session is open - may read the DB
 
     def dbCallback(self, msg=None, heading=None):
         util.DEBUG_LOG(msg or heading)
@@ -185,6 +195,9 @@ class UserContent:
                     b.delete_instance()
                     self.log('{0} Missing: {1} - REMOVED'.format(util.strRepr(name), util.strRepr(path)))
 
+        if cleaned:
+            DB.markChanged('bumpers')
+
         return cleaned
 
     def loadContent(self):
@@ -338,6 +351,8 @@ class UserContent:
             type_ = sub.replace(' Bumpers', '')
             self.addBumper(model, sub, path, type_name, sub_name, type_, sub_default)
 
+        DB.markChanged('bumpers')
+
     def addBumper(self, model, sub, path, type_name, sub_name, type_, sub_default, sub_val=None, prefix=None):
         for v in util.vfs.listdir(path):
             vpath = util.pathJoin(path, v)
@@ -402,6 +417,8 @@ class UserContent:
                 system=system.name
             )
 
+        DB.markChanged('ratings')
+
     @DB.session
     def scrapeContent(self):
         try:
@@ -514,6 +531,8 @@ class MusicHandler:
                 break
             self.addSongs(basePath, file)
 
+        DB.markChanged('music')
+
     def addSongs(self, base, file, sub=None):
         path = util.pathJoin(base, file)
 
@@ -560,6 +579,9 @@ class MusicHandler:
                 s.delete_instance()
                 self.owner.log('Song Missing: {0} - REMOVED'.format(util.strRepr(path)))
 
+        if cleaned:
+            DB.markChanged('music')
+
         return cleaned
 
 
@@ -669,18 +691,20 @@ class TriviaDirectoryHandler:
                 trivia[name] = {'q': None, 'c': {}, 'a': None}
 
             if ttype == 'q' or ttype == 'a':
-                trivia[name][ttype] = path
+                trivia[name][ttype] = c
             elif ttype == 'c':
-                trivia[name]['c'][clueCount] = path
+                trivia[name]['c'][clueCount] = c
+
+        directory = trivia and DB.triviaDirectoryID(basePath)
 
         for name, data in list(trivia.items()):
-            questionPath = data['q']
-            answerPath = data['a']
+            questionFile = data['q']
+            answerFile = data['a']
 
-            if not answerPath:
+            if not answerFile:
                 continue
 
-            if questionPath:
+            if questionFile:
                 ttype = 'QA'
                 self._callback('Loading Trivia (QA): [ {0} ]'.format(util.strRepr(name)))
             else:
@@ -692,35 +716,34 @@ class TriviaDirectoryHandler:
                 'TID': '{0}:{1}'.format(prefix, name),
                 'name': name,
                 'rating': rating,
-                'questionPath': questionPath
+                'questionFile': questionFile,
+                'pack': packPath(prefix)
             }
 
             for ct, key in enumerate(sorted(data['c'].keys())):
-                defaults['cluePath{0}'.format(ct)] = data['c'][key]
+                defaults['clueFile{0}'.format(ct)] = data['c'][key]
             try:
-                DB.Trivia.get_or_create(
-                    answerPath=answerPath,
+                trivia, created = DB.Trivia.get_or_create(
+                    directory=directory,
+                    answerFile=answerFile,
                     defaults=defaults
                 )
+                if not created:
+                    updatePack(DB.Trivia, trivia, defaults['pack'])
             except:
                 util.DEBUG_LOG(repr(data))
                 util.DEBUG_LOG(repr(defaults))
                 util.ERROR()
 
-    @DB.session
-    def processSimpleDir(self, path):
-        pack = os.path.basename(path.rstrip('\\/'))
-        contents = util.vfs.listdir(path)
-        for c in contents:
-            self.getSlide(path, c, pack)
-
     def getSlide(self, path, c, pack=''):
         name, ext = os.path.splitext(c)
         duration = 0
+        directory = DB.triviaDirectoryID(path)
         path = util.pathJoin(path, c)
 
         try:
-            DB.Trivia.get(DB.Trivia.answerPath == path)
+            trivia = DB.Trivia.get((DB.Trivia.directory == directory) & (DB.Trivia.answerFile == c))
+            updatePack(DB.Trivia, trivia, packPath(pack))
             self._callback('Loading Trivia (exists): [ {0} ]'.format(util.strRepr(name)))
         except DB.peewee.DoesNotExist:
             if ext.lower() in util.videoExtensions:
@@ -740,12 +763,14 @@ class TriviaDirectoryHandler:
                 return
 
             DB.Trivia.get_or_create(
-                answerPath=path,
+                directory=directory,
+                answerFile=c,
                 defaults={
                     'type': ttype,
                     'TID': '{0}:{1}'.format(pack, name),
                     'name': name,
-                    'duration': duration
+                    'duration': duration,
+                    'pack': packPath(pack)
                 }
             )
 
@@ -765,6 +790,10 @@ class TriviaDirectoryHandler:
                 t.delete_instance()
                 self._callback('Trivia Missing: {0} - REMOVED'.format(util.strRepr(path)))
 
+        removed = DB.cleanTriviaDirectories()
+        if removed:
+            self._callback('Trivia Directories Unused: {0} - REMOVED'.format(removed))
+
         return cleaned
 
 class SlideshowDirectoryHandler:
@@ -796,14 +825,17 @@ class SlideshowDirectoryHandler:
     def loadImageSlide(self, path, name, prefix):
         self._callback('Loading Slide Image: [ {0} ]'.format(util.strRepr(name)))
         try:
-            DB.Slideshow.get_or_create(
+            slide, created = DB.Slideshow.get_or_create(
                 slidePath=path,
                 defaults={
                     'type': 'image',
                     'TID': '{0}:{1}'.format(prefix, name),
-                    'name': name
+                    'name': name,
+                    'pack': packPath(prefix)
                 }
             )
+            if not created:
+                updatePack(DB.Slideshow, slide, packPath(prefix))
         except:
             util.DEBUG_LOG('Error loading slide')
             util.ERROR()
@@ -812,15 +844,18 @@ class SlideshowDirectoryHandler:
         duration = self.getVideoDuration(path)
         self._callback('Loading Slideshow (Video): [ {0} ({1}) ]'.format(util.strRepr(name), duration))
         try:
-            DB.Slideshow.get_or_create(
+            slide, created = DB.Slideshow.get_or_create(
                 slidePath=path,
                 defaults={
                     'type': 'video',
                     'TID': '{0}:{1}'.format(prefix, name),
                     'name': name,
+                    'pack': packPath(prefix),
                     'duration': duration
                 }
             )
+            if not created:
+                updatePack(DB.Slideshow, slide, packPath(prefix))
         except:
             util.DEBUG_LOG('Error loading Slideshow video')
             util.ERROR()
@@ -6,6 +6,12 @@ import xbmcvfs
 import os
 import shutil
 import re
+import random
+import threading
+import itertools
+import json
+import pickle
+import sqlite3
 
 try:
     datetime.datetime.strptime('0', '%H')
@@ -27,12 +33,15 @@ from . import util
 from resources.lib import kodiutil
 from . import content
 
-DATABASE_VERSION = 0.2
+DATABASE_VERSION = 0.3
 
 fn = peewee.fn
 DB = None
+MODELS = []
+TRIVIA_PATH_FIELDS = ['questionPath'] + ['cluePath{0}'.format(x) for x in range(10)] + ['answerPath']
 Settings = None
 Song = None
+TriviaDirectory = None
 Trivia = None
 Slideshow = None                
 AudioFormatBumpers = None
@@ -46,8 +55,17 @@ def session(func):
     def inner(*args, **kwargs):
         try:
             DB.connect(reuse_if_open=True)
-            with DB.atomic():
-                return func(*args, **kwargs)
+            try:
+                with DB.atomic():
+                    ret = func(*args, **kwargs)
+            except:
+                if not DB.in_transaction():  # Rolled back - nothing changed
+                    _PENDING_CHANGES.clear()
+                raise
+
+            if not DB.in_transaction():
+                _markPendingChanged()
+            return ret
         finally:
             DB.close()
     return inner
@@ -58,6 +76,501 @@ def connect():
 def close():
     DB.close()
 
+class RandomSampler(object):
+    """
+    Yields rows of a model in uniformly random order without an ORDER BY RANDOM() sort.
+
+    Integer keys are probed at random between the lowest and highest key, a chunk per
+    query, and the probes that hit a matching row not yet drawn are yielded in probe order.
+    Every probe is an index lookup, so taking a few rows doesn't read all the keys. Once
+    fewer than MIN_HIT_RATE of a chunk's probes hit (sparse keys, a narrow filter or most
+    rows drawn) the remaining matching keys are read in one query and shuffled.
+    """
+    CHUNK_SIZE = 50
+    MIN_HIT_RATE = 0.2
+
+    def __init__(self, model, *where):
+        self.model = model
+        self.where = where
+        self.pk = model._meta.primary_key
+
+    def __iter__(self):
+        return self.rows()
+
+    def ids(self):
+        query = self.model.select(self.pk)
+        if self.where:
+            query = query.where(*self.where)
+        return [pk for pk, in query.tuples()]
+
+    def fetch(self, ids, *where):
+        rows = dict((r._pk, r) for r in self.model.select().where(self.pk.in_(ids), *where))
+        return [rows[pk] for pk in ids if pk in rows]
+
+    def probe(self, low, high, seen):
+        ids = []
+        for _ in range(self.CHUNK_SIZE):
+            pk = random.randint(low, high)
+            if pk not in seen and pk not in ids:
+                ids.append(pk)
+
+        return self.fetch(ids, *self.where)
+
+    def rows(self):
+        seen = set()
+
+        if isinstance(self.pk, peewee.IntegerField):
+            low, high = self.model.select(fn.MIN(self.pk), fn.MAX(self.pk)).scalar(as_tuple=True)
+            if low is None:
+                return
+
+            while True:
+                rows = self.probe(low, high, seen)
+                for row in rows:
+                    seen.add(row._pk)
+                    yield row
+
+                if len(rows) < self.CHUNK_SIZE * self.MIN_HIT_RATE:
+                    break
+
+        ids = [pk for pk in self.ids() if pk not in seen]
+        random.shuffle(ids)
+        for i in range(0, len(ids), self.CHUNK_SIZE):
+            for row in self.fetch(ids[i:i + self.CHUNK_SIZE]):
+                yield row
+
+    def sample(self, k):
+        return list(itertools.islice(self.rows(), max(k, 0)))
+
+
+class WriteQueue(threading.Thread):
+    """
+    Single background writer for state updates made during a show.
+
+    Updates to the same row are merged while they wait and are written together
+    in one transaction, so the caller never waits on SQLite. A batch that fails to
+    write is merged back under newer updates and retried up to MAX_RETRIES times.
+    """
+    BATCH_DELAY = 2
+    MAX_RETRIES = 3
+    RETRY_DELAY = 1
+
+    def __init__(self):
+        threading.Thread.__init__(self, name='PreShowDBWriter')
+        self.daemon = True
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._writing = False
+        self._flushing = 0
+        self._failures = 0
+        self._dropped = 0
+        self._ids = itertools.count()
+
+    def update(self, model, field, value, **fields):
+        if isinstance(model._meta.database, SnapshotDatabase):  # Keep the show's view up to date
+            model._meta.database.write(model.update(**fields).where(field == value))
+        self._add((model, field.name, value), fields)
+
+    def insert(self, model, **fields):
+        self._add((model, None, next(self._ids)), fields)
+
+    def _add(self, key, fields):
+        with self._condition:
+            if key in self._pending:
+                self._pending[key].update(fields)
+            else:
+                self._pending[key] = fields
+            if len(self._pending) == 1:
+                self._condition.notify_all()
+
+    def flush(self, timeout=30):
+        """
+        Waits for pending updates to be written. Returns False on timeout or if updates were dropped since the last flush.
+        """
+        with self._condition:
+            self._flushing += 1
+            self._condition.notify_all()
+            try:
+                end = time.time() + timeout
+                while self._pending or self._writing:
+                    remaining = end - time.time()
+                    if remaining <= 0:
+                        util.LOG('WriteQueue: Timed out waiting for {0} pending updates'.format(len(self._pending)))
+                        return False
+                    self._condition.wait(remaining)
+            finally:
+                self._flushing -= 1
+
+            if self._dropped:
+                util.LOG('WriteQueue: {0} updates were dropped after failed writes'.format(self._dropped))
+                self._dropped = 0
+                return False
+        return True
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                if not self._flushing:
+                    self._condition.wait(self.BATCH_DELAY)
+                batch = self._pending
+                self._pending = {}
+                self._writing = True
+
+            try:
+                self.write(batch)
+                self._failures = 0
+            except:
+                util.ERROR()
+                self._retry(batch)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _retry(self, batch):
+        self._failures += 1
+        if self._failures > self.MAX_RETRIES:
+            util.LOG('WriteQueue: Dropping {0} updates after {1} failed writes'.format(len(batch), self._failures))
+            with self._condition:
+                self._dropped += len(batch)
+            self._failures = 0
+            return
+
+        time.sleep(self.RETRY_DELAY * self._failures)
+        with self._condition:
+            for key, fields in batch.items():
+                if key in self._pending:
+                    fields = dict(fields, **self._pending[key])
+                self._pending[key] = fields
+
+    def write(self, batch):
+        util.DEBUG_LOG('WriteQueue: Writing {0} updates'.format(len(batch)))
+        databases = {}
+        for key, fields in batch.items():
+            db = key[0]._meta.database
+            databases.setdefault(getattr(db, 'source', db), []).append((key, fields))
+
+        for db, updates in databases.items():
+            try:
+                db.connect(reuse_if_open=True)
+                with db.atomic():
+                    for (model, name, value), fields in updates:
+                        if name is None:
+                            db.execute(model.insert(**fields).on_conflict_ignore())
+                        else:
+                            db.execute(model.update(**fields).where(getattr(model, name) == value))
+            finally:
+                db.close()
+
+
+class SnapshotDatabase(peewee.SqliteDatabase):
+    """
+    In-memory copy of content.db taken with the SQLite backup API.
+
+    A running show reads from this copy so a content scan can write to the file
+    at the same time. Writes made for the show go through the WriteQueue, which
+    applies them here and to the file.
+
+    The copy is a named shared-cache memory database so each thread processing
+    the sequence gets its own connection to it. It lives until the connection of
+    the thread that pinned it is released.
+
+    Shared-cache connections fail at once instead of waiting when another one
+    holds a write lock, so the threads' connections only read (uncommitted, so
+    they see new rows straight away) and every write goes through write().
+    """
+    _ids = itertools.count()
+
+    def __init__(self, source):
+        name = 'file:preshow-snapshot-{0}-{1}?mode=memory&cache=shared'.format(os.getpid(), next(self._ids))
+        peewee.SqliteDatabase.__init__(self, name, uri=True, check_same_thread=False, pragmas={'read_uncommitted': 1})
+        self.source = source
+        self._writer = None
+        self._writeLock = threading.Lock()
+        source.connect(reuse_if_open=True)
+        try:
+            source.connection().backup(self.connection())
+        finally:
+            source.close()
+
+    def write(self, query):
+        """
+        Runs an insert or update query on a writer connection of its own, one at a time and committed at once.
+        """
+        sql, params = query.sql()
+        with self._writeLock:
+            if not self._writer:
+                self._writer = sqlite3.connect(self.database, uri=True, check_same_thread=False, isolation_level=None)
+            self._writer.execute(sql, params)
+
+    def close(self):
+        return False  # Closing would discard the copy
+
+    def release(self):
+        with self._writeLock:
+            if self._writer:
+                self._writer.close()
+                self._writer = None
+        return peewee.SqliteDatabase.close(self)
+
+
+_WRITE_QUEUE = None
+
+
+def writeQueue():
+    global _WRITE_QUEUE
+    if not _WRITE_QUEUE:
+        _WRITE_QUEUE = WriteQueue()
+        _WRITE_QUEUE.start()
+    return _WRITE_QUEUE
+
+
+def flushWrites():
+    if _WRITE_QUEUE:
+        _WRITE_QUEUE.flush()
+
+
+def pinSnapshot():
+    global DB
+    if not DB or isinstance(DB, SnapshotDatabase):
+        return
+
+    try:
+        snapshot = SnapshotDatabase(DB)
+    except:
+        util.ERROR('Failed to create database snapshot - using content.db directly')
+        return
+
+    util.DEBUG_LOG('Database snapshot pinned')
+    DB = snapshot
+    DB.bind(MODELS)
+
+
+def releaseSnapshot():
+    global DB
+    if not isinstance(DB, SnapshotDatabase):
+        return
+
+    snapshot = DB
+    DB = snapshot.source
+    DB.bind(MODELS)
+    snapshot.release()
+    util.DEBUG_LOG('Database snapshot released')
+
+
+def createRow(model, **fields):
+    """
+    Inserts a row for the show and, when a snapshot is pinned, queues the insert for content.db.
+    Returns nothing: a snapshot row's id is not the id content.db will assign, so later updates
+    must be keyed on a stable unique column instead.
+    """
+    if isinstance(DB, SnapshotDatabase):
+        DB.write(model.insert(**fields))
+        writeQueue().insert(model, **fields)
+    else:
+        model.create(**fields)
+
+
+_TRIVIA_DIRECTORIES = {}
+
+
+def triviaDirectoryPath(ID):
+    if ID not in _TRIVIA_DIRECTORIES:
+        _TRIVIA_DIRECTORIES[ID] = TriviaDirectory.get_by_id(ID).path
+    return _TRIVIA_DIRECTORIES[ID]
+
+
+def triviaDirectoryID(path):
+    directory, created = TriviaDirectory.get_or_create(path=path)
+    _TRIVIA_DIRECTORIES[directory.id] = path
+    return directory.id
+
+
+def cleanTriviaDirectories():
+    """
+    Deletes directories no trivia row refers to any more and forgets the cached paths.
+    Returns the number of directories removed.
+    """
+    used = Trivia.select(Trivia.directory).where(Trivia.directory.is_null(False))
+    removed = TriviaDirectory.delete().where(TriviaDirectory.id.not_in(used)).execute()
+    _TRIVIA_DIRECTORIES.clear()
+    return removed
+
+
+def _triviaPathProperty(column):
+    def getter(self):
+        name = getattr(self, column)
+        if not name or self.directory is None:
+            return None
+        return util.pathJoin(triviaDirectoryPath(self.directory), name)
+
+    return property(getter)
+
+
+def _changesPath():
+    return util.pathJoin(util.STORAGE_PATH, 'content.changes')
+
+
+def changeCounters():
+    try:
+        with open(_changesPath(), 'r') as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def changeCounter(name):
+    """
+    Returns a counter that is bumped whenever the content scan changes the named
+    data, so caches kept outside the DB can be validated without opening it.
+    """
+    counters = changeCounters()
+    return counters.get(name, 0) + counters.get('all', 0)
+
+
+_PENDING_CHANGES = set()
+
+
+def markChanged(*names):
+    """
+    Bumps the named counters, or every counter when called without names. Inside a transaction the
+    bump waits for the commit, so a cache built from the old rows is never stored under the new count.
+    """
+    names = names or ('all',)
+    if DB and DB.in_transaction():
+        _PENDING_CHANGES.update(names)
+        return
+
+    _bumpCounters(names)
+
+
+def _markPendingChanged():
+    if not _PENDING_CHANGES:
+        return
+
+    names = tuple(_PENDING_CHANGES)
+    _PENDING_CHANGES.clear()
+    _bumpCounters(names)
+
+
+def _bumpCounters(names):
+    counters = changeCounters()
+    for name in names:
+        counters[name] = counters.get(name, 0) + 1
+
+    try:
+        with open(_changesPath(), 'w') as f:
+            json.dump(counters, f)
+    except (IOError, OSError):
+        util.ERROR()
+
+
+def packWhere(model, pack):
+    """
+    Matches rows stored under the content-relative pack path or any of its sub
+    directories as an indexed range on the pack column ('/' sorts just before '0').
+    """
+    return (model.pack == pack) | ((model.pack >= pack + '/') & (model.pack < pack + '0'))
+
+
+BUMPER_CACHE_VERSION = 1
+_BUMPER_CATALOG = {}
+_BUMPER_LOCK = threading.Lock()
+
+
+class BumperCatalog(object):
+    """
+    Bumper paths indexed for selection during a show. Built from the bumper tables once and pickled
+    so later shows load it without querying until a content scan changes the bumpers.
+    """
+    def __init__(self):
+        self.ratings = {}       # (system, name, isImage) -> paths
+        self.ratingStyles = {}  # (system, name, isImage, style) -> paths
+        self.audioFormats = {}  # format -> paths
+        self.videoTypes = {}    # type -> paths
+
+    @session
+    def build(self):
+        query = RatingsBumpers.select(
+            RatingsBumpers.path, RatingsBumpers.system, RatingsBumpers.name, RatingsBumpers.isImage, RatingsBumpers.style
+        ).order_by(RatingsBumpers.id).tuples()
+        for path, system, name, isImage, style in query:
+            self.ratings.setdefault((system, name, bool(isImage)), []).append(path)
+            self.ratingStyles.setdefault((system, name, bool(isImage), style), []).append(path)
+
+        for path, format_ in AudioFormatBumpers.select(AudioFormatBumpers.path, AudioFormatBumpers.format).tuples():
+            self.audioFormats.setdefault(format_, []).append(path)
+
+        for path, type_ in VideoBumpers.select(VideoBumpers.path, VideoBumpers.type).tuples():
+            self.videoTypes.setdefault(type_, []).append(path)
+
+        return self
+
+    def ratingBumper(self, system, name, image=False, style=None):
+        """
+        Returns a random rating bumper path, or the first one of the given style.
+        """
+        if style is not None:
+            paths = self.ratingStyles.get((system, name, image, style))
+            return paths and paths[0] or None
+
+        paths = self.ratings.get((system, name, image))
+        return paths and random.choice(paths) or None
+
+    def audioFormatBumper(self, format_):
+        paths = self.audioFormats.get(format_)
+        return paths and random.choice(paths) or None
+
+    def videoBumpers(self, vtype, count):
+        paths = self.videoTypes.get(vtype, [])
+        return random.sample(paths, min(count, len(paths)))
+
+
+def _bumperCachePath():
+    return os.path.join(util.STORAGE_PATH, 'bumpers.cache')
+
+
+def bumperCatalog():
+    """
+    Returns the BumperCatalog for the current database, loading it from the cache when it matches
+    the 'bumpers' change counter.
+    """
+    with _BUMPER_LOCK:
+        return _bumperCatalog()
+
+
+def _bumperCatalog():
+    # The counter is read before the rows, so rows committed while building leave the cache stale rather than current
+    key = (BUMPER_CACHE_VERSION, getattr(DB, 'source', DB).database, changeCounter('bumpers'))
+    if _BUMPER_CATALOG.get('key') == key:
+        return _BUMPER_CATALOG['catalog']
+
+    catalog = None
+    try:
+        with open(_bumperCachePath(), 'rb') as f:
+            data = pickle.load(f)
+        if data.get('key') == key:
+            catalog = data['catalog']
+    except (IOError, OSError):
+        pass
+    except:
+        util.MINOR_ERROR('Bad bumper cache')
+
+    if not catalog:
+        catalog = BumperCatalog().build()
+        try:
+            with open(_bumperCachePath(), 'wb') as f:
+                pickle.dump({'key': key, 'catalog': catalog}, f, pickle.HIGHEST_PROTOCOL)
+        except:
+            util.ERROR('Failed to write bumper cache')
+
+    _BUMPER_CATALOG['key'] = key
+    _BUMPER_CATALOG['catalog'] = catalog
+    return catalog
+
+
 def dummyCallback(*args, **kwargs):
     pass
 
@@ -89,6 +602,7 @@ def checkDBVersion(DB):
                 xbmcvfs.delete(tempseq_path)                
             
             os.remove(dbPath)
+            markChanged()
 
             # New code to update and rename sequence files
             from resources.lib import kodiutil
@@ -96,6 +610,89 @@ def checkDBVersion(DB):
             if contentPath:
                 updateAndRenameSequenceFiles(util.pathJoin(contentPath, 'Sequences'))
 
+
+MAINTENANCE_BUSY_TIMEOUT = 30  # Seconds to wait on other connections' locks
+
+
+def maintain(path=None):
+    """
+    Keeps content.db healthy on long-lived installs: moves it to incremental
+    auto_vacuum (one full VACUUM), returns free pages, refreshes planner
+    statistics and logs integrity, fragmentation and table/index sizes.
+
+    The database is opened directly, without the version check or migration in
+    initialize(), and left alone if it is missing or not at DATABASE_VERSION.
+    """
+    dbPath = util.pathJoin(path or util.STORAGE_PATH, 'content.db')
+    if not util.vfs.exists(dbPath):
+        util.LOG('Maintenance: No database - skipping')
+        return
+
+    db = peewee.SqliteDatabase(dbPath, pragmas={'journal_mode': 'wal'}, timeout=MAINTENANCE_BUSY_TIMEOUT)
+    try:
+        db.connect()
+
+        try:
+            version = db.execute_sql("SELECT detail FROM settings WHERE setting = 'dbversion'").fetchone()
+            version = version and float(version[0])
+        except (peewee.OperationalError, ValueError):
+            version = None
+
+        if version != DATABASE_VERSION:
+            util.LOG('Maintenance: Database version {0} does not match {1} - skipping'.format(version, DATABASE_VERSION))
+            return
+
+        def pragma(name):
+            return db.execute_sql('PRAGMA {0}'.format(name)).fetchone()[0]
+
+        if pragma('auto_vacuum') != 2:
+            util.LOG('Maintenance: Migrating database to incremental auto_vacuum')
+            try:
+                db.execute_sql('PRAGMA auto_vacuum = INCREMENTAL')
+                db.execute_sql('VACUUM')
+            except peewee.OperationalError:
+                util.MINOR_ERROR('Maintenance: Database busy - auto_vacuum migration will be retried')
+
+        freePages = pragma('freelist_count')
+        if freePages:
+            util.LOG('Maintenance: Releasing {0} free pages'.format(freePages))
+            db.execute_sql('PRAGMA incremental_vacuum')
+
+        if db.execute_sql("SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+            db.execute_sql('PRAGMA optimize')
+        else:
+            db.execute_sql('ANALYZE')
+
+        db.execute_sql('PRAGMA wal_checkpoint(TRUNCATE)')
+
+        pageSize = pragma('page_size')
+        pageCount = pragma('page_count')
+        freePages = pragma('freelist_count')
+        util.LOG('Maintenance: Integrity: {0}'.format(pragma('quick_check')))
+        util.LOG('Maintenance: Size: {0:.1f}KB ({1} pages, {2:.1%} free)'.format(
+            pageSize * pageCount / 1024.0, pageCount, pageCount and float(freePages) / pageCount or 0
+        ))
+
+        try:
+            sizes = db.execute_sql(
+                'SELECT name, SUM(pgsize), SUM(unused) FROM dbstat GROUP BY name ORDER BY SUM(pgsize) DESC'
+            ).fetchall()
+        except peewee.OperationalError:  # SQLite built without the dbstat table
+            sizes = []
+
+        for name, size, unused in sizes:
+            util.LOG('Maintenance:   {0}: {1:.1f}KB ({2:.1%} unused)'.format(name, size / 1024.0, size and float(unused) / size or 0))
+
+        if not sizes:
+            for name, in db.execute_sql("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name").fetchall():
+                count = db.execute_sql('SELECT COUNT(*) FROM "{0}"'.format(name)).fetchone()[0]
+                util.LOG('Maintenance:   {0}: {1} rows'.format(name, count))
+    except peewee.OperationalError:
+        util.ERROR('Maintenance: Database busy - skipping')
+    finally:
+        db.close()
+
+
 def updateAndRenameSequenceFiles(directory):
     # Loop through all files in the directory
     for filename in os.listdir(directory):
@@ -134,7 +731,7 @@ def initialize(path=None, callback=None):
     callback = callback or dummyCallback
     callback(None, 'Creating/updating database...')
 
-    global DB, Settings, Song, Trivia, PreShowTrivia, Slideshow
+    global DB, MODELS, Settings, Song, TriviaDirectory, Trivia, PreShowTrivia, Slideshow
     global AudioFormatBumpers, RatingsBumpers, VideoBumpers, RatingSystem, Rating, Trailers
 
     dbDir = path or util.STORAGE_PATH
@@ -144,7 +741,11 @@ def initialize(path=None, callback=None):
     dbPath = util.pathJoin(dbDir, 'content.db')
     dbExists = util.vfs.exists(dbPath)
 
-    DB = peewee.SqliteDatabase(dbPath)
+    _TRIVIA_DIRECTORIES.clear()
+    _BUMPER_CATALOG.clear()
+
+    # WAL lets a show read (or snapshot) the database while a content scan writes to it
+    DB = peewee.SqliteDatabase(dbPath, pragmas={'journal_mode': 'wal'})
     DB.connect()
 
     class Settings(peewee.Model):
@@ -189,21 +790,41 @@ def initialize(path=None, callback=None):
 
     callback(' - Trivia')
 
+    class TriviaDirectory(peewee.Model):
+        path = peewee.CharField(unique=True)
+
+        class Meta:
+            database = DB
+
+    TriviaDirectory.create_table(fail_silently=True)
+
+    # Slide files are stored by name relative to an interned directory. The
+    # full paths are available as read-only properties (answerPath etc.)
     class Trivia(ContentBase):
         TID = peewee.CharField(unique=True)
         type = peewee.CharField()
-        questionPath = peewee.CharField(unique=True, null=True)
-        cluePath0 = peewee.CharField(unique=True, null=True)
-        cluePath1 = peewee.CharField(unique=True, null=True)
-        cluePath2 = peewee.CharField(unique=True, null=True)
-        cluePath3 = peewee.CharField(unique=True, null=True)
-        cluePath4 = peewee.CharField(unique=True, null=True)
-        cluePath5 = peewee.CharField(unique=True, null=True)
-        cluePath6 = peewee.CharField(unique=True, null=True)
-        cluePath7 = peewee.CharField(unique=True, null=True)
-        cluePath8 = peewee.CharField(unique=True, null=True)
-        cluePath9 = peewee.CharField(unique=True, null=True)
-        answerPath = peewee.CharField(unique=True, null=True)
+        directory = peewee.IntegerField(null=True)
+        questionFile = peewee.CharField(null=True)
+        clueFile0 = peewee.CharField(null=True)
+        clueFile1 = peewee.CharField(null=True)
+        clueFile2 = peewee.CharField(null=True)
+        clueFile3 = peewee.CharField(null=True)
+        clueFile4 = peewee.CharField(null=True)
+        clueFile5 = peewee.CharField(null=True)
+        clueFile6 = peewee.CharField(null=True)
+        clueFile7 = peewee.CharField(null=True)
+        clueFile8 = peewee.CharField(null=True)
+        clueFile9 = peewee.CharField(null=True)
+        answerFile = peewee.CharField(null=True)
+
+        class Meta:
+            indexes = (
+                (('pack',), False),
+                (('directory', 'answerFile'), True)
+            )
+
+    for name in TRIVIA_PATH_FIELDS:
+        setattr(Trivia, name, _triviaPathProperty(name.replace('Path', 'File')))
 
     Trivia.create_table(fail_silently=True)
 	
@@ -242,7 +863,10 @@ def initialize(path=None, callback=None):
         type = peewee.CharField()
         TID = peewee.CharField(unique=True)
         slidePath = peewee.CharField(unique=True, null=True)
-        watched = peewee.IntegerField(default=0)     
+        watched = peewee.IntegerField(default=0)
+
+        class Meta:
+            indexes = ((('pack',), False),)
 
     Slideshow.create_table(fail_silently=True)
     
@@ -325,6 +949,11 @@ def initialize(path=None, callback=None):
 
     Trailers.create_table(fail_silently=True)
 
+    MODELS = [
+        Settings, Song, TriviaDirectory, Trivia, PreShowTrivia, Slideshow, AudioFormatBumpers,
+        RatingsBumpers, VideoBumpers, RatingSystem, Rating, Trailers
+    ]
+
     callback(' - Trailers')
     callback(None, 'Database created')
 
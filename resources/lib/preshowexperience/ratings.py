@@ -1,3 +1,7 @@
+import os
+import pickle
+import functools
+import threading
 from . import util
 from . import database as DB
 from xml.etree import ElementTree as ET
@@ -11,6 +15,11 @@ COUNTRY_SYSTEMS = {
 }
 
 DEFAULT_RATING_SYSTEM = None
+SYSTEMS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rating_systems')
+CACHE_VERSION = 2
+
+_LOADED = False
+_LOAD_LOCK = threading.RLock()
 
 
 def getSystemByCountry(country_code):
@@ -36,6 +45,7 @@ class RatingSystem:
     ratings = None
     regEx = None
     regions = None
+    _index = None
 
     def __repr__(self):
         return '{0}: {1}'.format(self.name, self.ratings)
@@ -47,18 +57,19 @@ class RatingSystem:
         return self.ratings[idx]
 
     def getRatingByName(self, name):
-        name = str(name)
-        name = name.upper()
-        for r in self.ratings:
-            if r.name == name:
-                return r
-        return NO_RATING
+        if self._index is None:
+            self._index = {}
+            for r in self.ratings or ():
+                self._index.setdefault(r.name.upper(), r)
+        return self._index.get(str(name).upper(), NO_RATING)
 
     def addRating(self, rating):
         if not self.ratings:
             self.ratings = []
         rating.system = self.name
         self.ratings.append(rating)
+        self._index = None
+        _resolveRating.cache_clear()
 
     def addRegEx(self, context, regex):
         if not self.regEx:
@@ -133,6 +144,9 @@ class MPAA(RatingSystem):
     ratings = [G, PG, PG_13, R, NC_17, NR]
     regions = ['US']
 
+    def __init__(self):
+        self.ratings = list(self.ratings)  # Ratings added from the DB must not leak into the class
+
 
 class XMLRatingSystem(RatingSystem):
     @classmethod
@@ -168,6 +182,7 @@ NO_RATING = Rating('', 1000)
 
 
 def getRatingsSystem(name):
+    ensureLoaded()
     #util.DEBUG_LOG(name)
     name = str(name)
     system = name.upper()
@@ -175,36 +190,43 @@ def getRatingsSystem(name):
 
 
 def getRating(system_or_name, name=None):
+    ensureLoaded()
+    return _resolveRating(system_or_name, name, DEFAULT_RATING_SYSTEM)
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolveRating(system_or_name, name, default_system):
     system = system_or_name
-    #util.DEBUG_LOG(system)
     if not name:
         if ':' in system_or_name:
             system, name = system_or_name.split(':', 1)
-        elif DEFAULT_RATING_SYSTEM:
+        elif default_system:
             name = system_or_name
-            system = DEFAULT_RATING_SYSTEM
+            system = default_system
 
     if not name:
         return NO_RATING
 
-    system = getRatingsSystem(system)
+    system = RATINGS_SYSTEMS.get(str(system).upper())
 
     if not system:
         return NO_RATING
 
-    #util.DEBUG_LOG(system)
     return system.getRatingByName(name)
 
 
 def addRatingSystemFromXML(xml):
+    ensureLoaded()
     system = XMLRatingSystem.fromXML(xml)
 
     RATINGS_SYSTEMS[system.name.upper()] = system
+    _resolveRating.cache_clear()
 
     return system
 
 
 def getRegExs(context=None):
+    ensureLoaded()
     ret = {}
     for system in list(RATINGS_SYSTEMS.values()):
         regEx = system.getRegEx(context)
@@ -213,6 +235,11 @@ def getRegExs(context=None):
     return ret
 
 
+def ratingsSystems():
+    ensureLoaded()
+    return list(RATINGS_SYSTEMS.values())
+
+
 def setCountry(country_code):
     global DEFAULT_RATING_SYSTEM
     DEFAULT_RATING_SYSTEM = getSystemByCountry(country_code)
@@ -230,18 +257,15 @@ def defaultRatingsSystem():
 
 
 def loadFromXML():
-    import os
-    import inspect
-
-    systemsFolder = os.path.join(os.path.realpath(os.path.abspath(os.path.split(inspect.getfile(inspect.currentframe()))[0])), 'rating_systems')
-    for p in os.listdir(systemsFolder):
-        path = os.path.join(systemsFolder, p)
+    for p in os.listdir(SYSTEMS_FOLDER):
+        path = os.path.join(SYSTEMS_FOLDER, p)
 
         with open(path, 'r') as f:
-            addRatingSystemFromXML(f.read())
+            system = XMLRatingSystem.fromXML(f.read())
+            RATINGS_SYSTEMS[system.name.upper()] = system
+    _resolveRating.cache_clear()
 
 
-@DB.session
 def loadFromDB():
     for system in DB.RatingSystem.select():
         if system.name in RATINGS_SYSTEMS:
@@ -251,6 +275,7 @@ def loadFromDB():
             rs.name = system.name
             rs.addRegEx(system.context, system.regEx)
             RATINGS_SYSTEMS[system.name] = rs
+            _resolveRating.cache_clear()
             if system.regions:
                 for r in system.regions.split(','):
                     rs.addRegion(r)
@@ -261,14 +286,74 @@ def loadFromDB():
         RATINGS_SYSTEMS[rating.system].addRating(Rating(rating.name, rating.value, rating.internal))
 
 
-def load():
-    DB.initialize()
-    loadFromXML()
-    loadFromDB()
+def _cachePath():
+    return os.path.join(util.STORAGE_PATH, 'ratings.cache')
+
+
+def _cacheKey():
+    files = sorted((p, os.path.getmtime(os.path.join(SYSTEMS_FOLDER, p))) for p in os.listdir(SYSTEMS_FOLDER))
+    return (CACHE_VERSION, files, DB.changeCounter('ratings'))
+
+
+def _loadCache(key):
+    try:
+        with open(_cachePath(), 'rb') as f:
+            data = pickle.load(f)
+    except (IOError, OSError):
+        return False
+    except:
+        util.MINOR_ERROR('Bad ratings cache')
+        return False
+
+    if data.get('key') != key:
+        return False
+
+    RATINGS_SYSTEMS.update(data['systems'])
+    COUNTRY_SYSTEMS.update(data['countries'])
+    _resolveRating.cache_clear()
+    return True
+
+
+def _saveCache(key):
+    try:
+        with open(_cachePath(), 'wb') as f:
+            pickle.dump({'key': key, 'systems': RATINGS_SYSTEMS, 'countries': COUNTRY_SYSTEMS}, f, pickle.HIGHEST_PROTOCOL)
+    except:
+        util.ERROR('Failed to write ratings cache')
+
+
+def ensureLoaded():
+    global _LOADED
+    if _LOADED:
+        return
+
+    with _LOAD_LOCK:
+        if _LOADED:
+            return
+
+        key = _cacheKey()
+        if _loadCache(key):
+            util.DEBUG_LOG('Rating Systems: (cached)')
+        else:
+            loadFromXML()
+            if not DB.DB:
+                DB.initialize()
+            if DB.DB.is_closed():
+                DB.session(loadFromDB)()
+            else:  # Inside the caller's session - closing it here would fail mid-transaction
+                loadFromDB()
+            _saveCache(key)
+            util.DEBUG_LOG('Rating Systems:')
+
+        _LOADED = True
 
-    util.DEBUG_LOG('Rating Systems:')
     for rs in list(RATINGS_SYSTEMS.values()):
         util.DEBUG_LOG('  {0}'.format(repr(rs)))
 
 
-load()
+def load():
+    global _LOADED
+    with _LOAD_LOCK:
+        _LOADED = False
+        ensureLoaded()
+
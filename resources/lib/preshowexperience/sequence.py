@@ -1,9 +1,12 @@
+import copy
+import hashlib
 import json
 import os
 import re
 import datetime
 import calendar
 import time
+import bisect
 from . import ratings
 from . import exceptions
 from . import util
@@ -141,6 +144,90 @@ def _getConditionValueString(itype, val):
 
     return util.strRepr(val)
 
+def _dataHash(data):
+    return hashlib.md5(data.encode('utf-8')).hexdigest()
+
+
+def _isLocalPath(path):
+    return '://' not in path and os.path.isdir(os.path.dirname(path))
+
+
+def _removeTemp(path, local):
+    try:
+        if local:
+            os.remove(path)
+        elif util.vfs.exists(path):
+            util.vfs.delete(path)
+    except (IOError, OSError):
+        pass
+
+
+def writeVerified(path, data):
+    """
+    Writes data to a temp file next to path, verifies it against a hash of data and renames it over path,
+    so an interrupted save leaves the previous file in place. Returns False if the file could not be written.
+    """
+    tmpPath = path + '.tmp'
+    dataHash = _dataHash(data)
+    local = _isLocalPath(path)
+
+    if local:
+        try:
+            with open(tmpPath, 'wb') as f:  # Bytes, so newlines are not translated and the hash matches the read back
+                f.write(data.encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+        except (IOError, OSError):
+            util.ERROR('Failed to write: {0}'.format(util.strRepr(tmpPath)))
+            _removeTemp(tmpPath, local)
+            return False
+    else:
+        with util.vfs.File(tmpPath, 'w') as f:
+            written = f.write(data)
+        if not written:
+            _removeTemp(tmpPath, local)
+            return False
+
+    # Make sure we can read the written file
+    try:
+        try:
+            with util.vfs.File(tmpPath, 'r') as f:
+                written = f.read()
+        except:
+            raise exceptions.SequenceWriteReadUnknownException()
+
+        if not written:
+            raise exceptions.SequenceWriteReadEmptyException()
+
+        if _dataHash(written) != dataHash:
+            raise exceptions.SequenceWriteReadBadException()
+    except:
+        _removeTemp(tmpPath, local)
+        raise
+
+    if local:
+        os.replace(tmpPath, path)
+        return True
+
+    if util.vfs.rename(tmpPath, path):
+        return True
+
+    # Some VFS sources will not rename over an existing file, so move the old one aside until the new one is in place
+    backupPath = path + '.bak'
+    if util.vfs.exists(backupPath):
+        util.vfs.delete(backupPath)
+    if not util.vfs.rename(path, backupPath):
+        _removeTemp(tmpPath, local)
+        return False
+    if not util.vfs.rename(tmpPath, path):
+        util.vfs.rename(backupPath, path)
+        _removeTemp(tmpPath, local)
+        return False
+    util.vfs.delete(backupPath)
+
+    return True
+
+
 class SequenceData(object):
     def __init__(self, data_string='', path_name=''):
         self.pathName = path_name
@@ -242,25 +329,12 @@ class SequenceData(object):
     def save(self, path=None):
         path = path or self._loadPath
 
-        if util.vfs.exists(path):
-            util.vfs.delete(path)
-
-        with util.vfs.File(path, 'w') as f:
-            success = f.write(self.serialize())
+        data = self.serialize()
+        success = writeVerified(path, data)
 
         if not success:
             return False
 
-        # Make sure we can read the written file
-        try:
-            self.load(path)
-        except exceptions.EmptySequenceFileException:
-            raise exceptions.SequenceWriteReadEmptyException()
-        except exceptions.BadSequenceFileException:
-            raise exceptions.SequenceWriteReadEmptyException()
-        except:
-            raise exceptions.SequenceWriteReadUnknownException()
-
         filename = re.split(r'[/\\]', path)[-1]
         #filename = os.path.splitext(filename)[0]
         self.pathName = self.pathName or filename
@@ -268,6 +342,14 @@ class SequenceData(object):
 
         return success
 
+    def indexEntry(self):
+        """
+        Returns a copy without items for the sequence index
+        """
+        obj = copy.copy(self)
+        obj._items = []
+        return obj
+
     def serialize(self):
         data = []
         for i in self._items:
@@ -377,7 +459,7 @@ class SequenceData(object):
                             if year[0] <= feature.year:
                                 return 5
                         else:
-                            if year[1] <= feature.year <= year[2]:
+                            if year[0] <= feature.year <= year[1]:
                                 return 5
                     else:
                         if year[0] == feature.year:
@@ -464,13 +546,269 @@ class SequenceData(object):
 
         return 0
 
+class IntervalIndex(object):
+    """
+    Maps closed intervals to sequence indexes for point lookups. A bound of None is open.
+    The sorted interval ends split the value range into regions, each holding the set of indexes
+    covering it, so a lookup is a bisect.
+    """
+    def __init__(self, intervals):
+        intervals = list(intervals)
+        self._ends = sorted(set(e for lo, hi, i in intervals for e in (lo, hi) if e is not None))
+        self._regions = [set() for r in range(len(self._ends) * 2 + 1)]
+
+        for lo, hi, i in intervals:
+            start = 0 if lo is None else bisect.bisect_left(self._ends, lo) * 2 + 1
+            end = len(self._regions) - 1 if hi is None else bisect.bisect_left(self._ends, hi) * 2 + 1
+            for r in range(start, end + 1):
+                self._regions[r].add(i)
+
+    def lookup(self, value):
+        pos = bisect.bisect_left(self._ends, value)
+        if pos < len(self._ends) and self._ends[pos] == value:
+            return self._regions[pos * 2 + 1]
+        return self._regions[pos * 2]
+
+
+class SequenceMatcher(object):
+    """
+    Compiles the conditions of a list of sequences into indexes so a feature can be matched by looking up
+    its attribute values. Scoring is the same as SequenceData.matchesFeatureAttr applied in PRIORITY order.
+    """
+    PRIORITY = ('featuretitle', 'ratings', 'videoaspect', 'tags', 'year', 'studio', 'director', 'actor', 'genre', 'dates', 'times')
+
+    # Attribute -> sequence condition key for conditions matched by value lookup
+    VALUE_ATTRS = {
+        'studio': 'studios',
+        'director': 'directors',
+        'actor': 'actors',
+        'tags': 'tags',
+        'genre': 'genres',
+        'videoaspect': 'videoaspect'
+    }
+
+    # Conditions matched by interval lookup
+    INTERVAL_ATTRS = ('ratings', 'year', 'dates', 'times')
+
+    def __init__(self, sequences):
+        self.sequences = list(sequences)
+        self._values = {}       # attr -> {lower-cased value: set of sequence indexes}
+        self._constrained = {}  # attr -> set of sequence indexes with conditions for attr
+        self._intervals = {}    # attr -> IntervalIndex
+        self._titleLengths = set()
+
+        for attr in self.PRIORITY:
+            self._values[attr] = {}
+            self._constrained[attr] = set()
+
+        intervals = dict((attr, []) for attr in self.INTERVAL_ATTRS)
+
+        for i, seq in enumerate(self.sequences):
+            for attr in self.PRIORITY:
+                if attr in self.VALUE_ATTRS:
+                    values = [v.lower() for v in seq.get(self.VALUE_ATTRS[attr], []) if v]
+                    for v in values:
+                        self._values[attr].setdefault(v, set()).add(i)
+                elif attr == 'featuretitle':
+                    values = [v.lower() for v in seq.get(attr, []) if v]
+                    for v in values:
+                        self._values[attr].setdefault(v, set()).add(i)
+                        self._titleLengths.add(len(v))
+                else:
+                    values = seq.get(attr, [])
+                    for cond in values:
+                        try:
+                            lo, hi = self._conditionInterval(attr, cond)
+                        except Exception:
+                            util.ERROR()
+                            continue
+                        intervals[attr].append((lo, hi, i))
+
+                if values:
+                    self._constrained[attr].add(i)
+
+        for attr in self.INTERVAL_ATTRS:
+            self._intervals[attr] = IntervalIndex(intervals[attr])
+
+    def _conditionInterval(self, attr, cond):
+        if attr == 'ratings':
+            if len(cond) > 1:
+                return (cond[0].value if cond[0] else None, cond[1].value if cond[1] else None)
+            return (cond[0].value, cond[0].value)
+        elif attr == 'year':
+            if len(cond) > 1:
+                return (cond[0], cond[1] or None)
+            return (cond[0], cond[0])
+        elif attr == 'dates':
+            if len(cond) > 1:
+                return (tuple(cond[0]), tuple(cond[1]))
+            return (tuple(cond[0]), tuple(cond[0]))
+        elif attr == 'times':
+            if len(cond) > 1:
+                return (tuple(cond[0]), tuple(cond[1]))
+            # A single time matches the whole hour
+            return ((cond[0][0], 0), (cond[0][0], 59))
+
+    def _featureKey(self, attr, feature):
+        if attr == 'ratings':
+            return getattr(feature.rating, 'value', None)
+        elif attr == 'year':
+            return feature.year if isinstance(feature.year, int) else None
+
+        now = datetime.datetime.now()
+        if attr == 'dates':
+            return (now.month, now.day)
+        return (now.hour, now.minute)
+
+    def _featureValues(self, attr, feature):
+        if attr == 'studio':
+            values = []
+            for studio in feature.studios:
+                values.append(studio.lower())
+                values.append(re.sub(r'\s?studios?(\s?)', r'\1', studio.lower()))
+            return values
+        elif attr == 'director':
+            return [d.lower() for d in feature.directors]
+        elif attr == 'actor':
+            return [role['name'].lower() for role in feature.cast]
+        elif attr == 'tags':
+            return [t.lower() for t in feature.tags]
+        elif attr == 'genre':
+            return [g.lower() for g in feature.genres[:3]]
+        elif attr == 'videoaspect':
+            return [feature.videoaspect.lower()]
+        elif attr == 'featuretitle':
+            # Every substring of the title as long as a title condition
+            title = feature.title.lower()
+            return [title[s:s + n] for n in self._titleLengths for s in range(len(title) - n + 1)]
+
+    def _matched(self, attr, feature):
+        """
+        Returns {sequence index: score} for the sequences whose conditions for attr match feature,
+        or None if feature has no usable value for attr.
+        """
+        if attr in self.INTERVAL_ATTRS:
+            key = self._featureKey(attr, feature)
+            if key is None:
+                return None
+            return dict.fromkeys(self._intervals[attr].lookup(key), 5)
+
+        index = self._values[attr]
+        matched = {}
+        if attr == 'genre':
+            # Only the first three genres count, for 5, 3 and 1
+            for val, g in zip((5, 3, 1), self._featureValues(attr, feature)):
+                for i in index.get(g, ()):
+                    matched[i] = matched.get(i, 0) + val
+        else:
+            for v in self._featureValues(attr, feature):
+                for i in index.get(v, ()):
+                    matched[i] = 5
+
+        return matched
+
+    def _scores(self, attr, feature, candidates):
+        """
+        Returns {sequence index: score} for candidates with conditions for attr. A negative score means no match.
+        """
+        constrained = self._constrained[attr] & candidates
+        if not constrained:
+            return {}
+
+        try:
+            matched = self._matched(attr, feature)
+        except Exception:
+            util.ERROR()
+            return dict.fromkeys(constrained, 0)
+
+        if matched is None:
+            # Features without the value are rare, leave them to the full comparison
+            return dict((i, self.sequences[i].matchesFeatureAttr(attr, feature)) for i in constrained)
+
+        scores = dict.fromkeys(constrained, -1)
+        for i, score in matched.items():
+            if i in constrained:
+                scores[i] = score
+
+        return scores
+
+    def match(self, feature, explain=None):
+        """
+        Returns a list of [sequence, score] for the sequences matching feature, in sequence order.
+        If explain is a list, a line describing each step is appended to it.
+        """
+        candidates = set(range(len(self.sequences)))
+        totals = {}
+
+        for attr in self.PRIORITY:
+            scores = self._scores(attr, feature, candidates)
+            failed = set()
+
+            for i, score in scores.items():
+                if score < 0:
+                    failed.add(i)
+                elif score:
+                    totals[i] = totals.get(i, 0) + score
+
+            candidates -= failed
+
+            if explain is not None and scores:
+                explain.append('{0}: {1}'.format(attr, ', '.join(
+                    '{0}({1})'.format(util.strRepr(self.sequences[i].name), 'X' if i in failed else '+{0}'.format(scores[i]))
+                    for i in sorted(scores)
+                )))
+
+            if not candidates:
+                break
+
+        return [[self.sequences[i], totals.get(i, 0)] for i in sorted(candidates)]
+
+    def explain(self, feature):
+        """
+        Returns a readable description of how feature was matched against the sequences.
+        """
+        lines = []
+        matches = self.match(feature, explain=lines)
+        lines.append('MATCHES: {0}'.format(', '.join('{0}({1})'.format(util.strRepr(m[0].name), m[1]) for m in matches) or 'None'))
+        return '\n'.join(lines)
+
+
 ################################################################################
 # BASE class for all content items
 ################################################################################
-class Item(object):
+class ItemType(type):
+    """
+    Compiles an Item class's _elements into attribute lookup tables and gives its instances a __slots__
+    layout of the element attributes plus any extra attributes listed in _slots.
+    """
+    def __new__(mcs, name, bases, namespace):
+        inherited = set()
+        for base in bases:
+            for klass in base.__mro__:
+                inherited.update(getattr(klass, '__slots__', ()))
+
+        attrs = [e['attr'] for e in namespace.get('_elements', ())] + list(namespace.get('_slots', ()))
+        slots = []
+        for attr in attrs:
+            if attr not in inherited and attr not in slots:
+                slots.append(attr)
+        namespace['__slots__'] = tuple(slots)
+
+        cls = type.__new__(mcs, name, bases, namespace)
+
+        cls._elementMap = dict((e['attr'], e) for e in cls._elements)
+        cls._elementIndex = dict((e['attr'], i) for i, e in enumerate(cls._elements))
+        cls._defaults = tuple((e['attr'], e.get('default', '')) for e in cls._elements)
+        cls._converters = dict((e['attr'], e['type']) for e in cls._elements if e.get('type'))
+
+        return cls
+
+
+class Item(object, metaclass=ItemType):
     _tag = 'item'   # XML tag when serialized
     _type = 'BASE'  # Name of the type of content. Equal to the xml tag type attribute when serialized
     _elements = ()  # Tuple of attributes to serialize
+    _slots = ('enabled', 'name')  # Instance attributes not in _elements
     displayName = ''
     typeChar = ''
 
@@ -479,7 +817,7 @@ class Item(object):
         self.name = ''
 
     def _set(self, attr, value):
-        conv = self.elementData('type')
+        conv = self._converters.get(attr)
         if conv:
             value = conv(value)
         setattr(self, attr, value)
@@ -528,10 +866,7 @@ class Item(object):
         for e in new._elements:
             sub = node.find(e['attr'])
             if sub is not None:
-                if e['type']:
-                    new._set(e['attr'], e['type'](sub.text))
-                else:
-                    new._set(e['attr'], sub.text)
+                new._set(e['attr'], sub.text)  # _set() converts the text
         return new
 
     # -- Serialize: JSON --------------------------------------
@@ -569,13 +904,11 @@ class Item(object):
         return new
 
     def resetToDefaults(self):
-        for e in self._elements:
-            setattr(self, e['attr'], e.get('default', ''))
+        for attr, default in self._defaults:
+            setattr(self, attr, default)
 
     def elementData(self, element_name):
-        for e in self._elements:
-            if element_name == e['attr']:
-                return e
+        return self._elementMap.get(element_name)
 
     def getSettingOptions(self, attr):
         limits = self.elementData(attr)['limits']
@@ -599,18 +932,16 @@ class Item(object):
         return util.getSettingDefault('{0}.{1}'.format(self._type, attr))
 
     def getSettingIndex(self, attr):
-        for i, e in enumerate(self._elements):
-            if e['attr'] == attr:
-                return i
+        return self._elementIndex.get(attr)
 
     def getElement(self, attr):
-        return self._elements[self.getSettingIndex(attr)]
+        return self._elementMap[attr]
 
     def getLimits(self, attr):
-        return self._elements[self.getSettingIndex(attr)]['limits']
+        return self._elementMap[attr]['limits']
 
     def getType(self, attr):
-        return self._elements[self.getSettingIndex(attr)]['type']
+        return self._elementMap[attr]['type']
 
     def display(self):
         return self.name or self.displayName
@@ -726,6 +1057,7 @@ class Feature(Item):
 ################################################################################
 class Trivia(Item):
     _type = 'trivia'
+    _slots = ('format',)
     _elements = (   
         {
             'attr': 'triviaSelect',
@@ -839,6 +1171,7 @@ class Trivia(Item):
 ################################################################################
 class Slideshow(Item):
     _type = 'slideshow'
+    _slots = ('format', 'duration', 'sDuration')
     _elements = (     
         {
             'attr': 'slideshoworder',
@@ -988,6 +1321,7 @@ class Slideshow(Item):
 ################################################################################
 class Trailer(Item):
     _type = 'trailer'
+    _slots = ('order', 'quality')
     _elements = (
         {
             'attr': 'source',
@@ -1406,6 +1740,7 @@ def buildTimeOfDay():
     
 class Command(Item):
     _type = 'command'
+    _slots = ('started', 'until')
     _elements = (
         {
             'attr': 'command',
@@ -1,5 +1,9 @@
 import os
+import copy
+import json
+import hashlib
 import random
+import concurrent.futures
 import re
 import time
 import datetime
@@ -98,8 +102,101 @@ class Song(Playable):
     def durationInt(self):
         return int(self['duration'])
 
+class MusicRotation:
+    """
+    Builds image queue playlists that just cover a target duration. Songs are drawn from a shuffled
+    rotation kept across shows, so every song in a source plays before any repeats, and durations
+    probed from files are cached.
+    """
+    def __init__(self):
+        self.path = os.path.join(util.STORAGE_PATH, 'music.rotation')
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            try:
+                with open(self.path, 'r') as f:
+                    self._data = json.load(f)
+            except (IOError, OSError, ValueError):
+                self._data = {}
+            self._data.setdefault('rotations', {})
+            self._data.setdefault('durations', {})
+        return self._data
+
+    def save(self):
+        if self._data is None:
+            return
+
+        try:
+            with open(self.path, 'w') as f:
+                json.dump(self._data, f)
+        except (IOError, OSError):
+            util.ERROR('Failed to save music rotation')
+
+    def duration(self, path):
+        durations = self.data['durations']
+        if path not in durations:
+            import mutagen
+            mutagen.setFileOpener(util.vfs.File)
+
+            try:
+                data = mutagen.File(path)
+            except:
+                data = None
+                util.ERROR()
+
+            durations[path] = data and data.info.length or 0
+        return durations[path]
+
+    def songs(self, key, stamp, candidates, target):
+        """
+        Returns Songs for the rotation named key until target seconds are covered. candidates() returns
+        a list of (path, duration or None) and is only called when the rotation runs out or stamp changes.
+        """
+        rotation = self.data['rotations'].get(key)
+        if not rotation or rotation['stamp'] != stamp:
+            rotation = {'stamp': stamp, 'remaining': []}
+            self.data['rotations'][key] = rotation
+
+        songs = []
+        total = 0
+        while total < target or not songs:
+            if not rotation['remaining']:
+                if songs and not total:  # A whole rotation of zero length songs
+                    break
+
+                rotation['remaining'] = [list(c) for c in candidates()]
+                if not rotation['remaining']:
+                    break
+                random.shuffle(rotation['remaining'])
+
+            path, duration = rotation['remaining'].pop()
+            if duration is None:
+                duration = self.duration(path)
+            songs.append(Song(path, duration))
+            total += duration
+
+        return songs
+
+    @staticmethod
+    def listingStamp(paths):
+        return hashlib.md5('\n'.join(sorted(paths)).encode('utf-8')).hexdigest()
+
+
+_MUSIC_ROTATION = None
+
+
+def musicRotation():
+    global _MUSIC_ROTATION
+    if not _MUSIC_ROTATION:
+        _MUSIC_ROTATION = MusicRotation()
+    return _MUSIC_ROTATION
+
+
 class ImageQueue(PlayableQueue):
     type = 'IMAGE.QUEUE'
+    FILL_BUFFER = 120  # Seconds of images to queue beyond maxDuration up front
 
     def __init__(self, handler, s_item, *args, **kwargs):
         dict.__init__(self, *args, **kwargs)
@@ -113,22 +210,62 @@ class ImageQueue(PlayableQueue):
         self.musicVolume = 85
         self.musicFadeIn = 3.0
         self.musicFadeOut = 3.0
+        self._cursor = None
+        self._paths = set()
+        self._setIDs = set()
 
     def __iadd__(self, other):
         for o in other:
             self.duration += o.duration
 
         self.queue += other
+        self._track(other)
         return self
 
+    def _track(self, images):
+        for i in images:
+            self._paths.add(i.path)
+            if i.setID is not None:
+                self._setIDs.add(i.setID)
+
+    def fill(self, sets):
+        """
+        Adds image sets from sets until the queue covers maxDuration plus FILL_BUFFER.
+        Anything after that is requested through _next() as the show needs it.
+        """
+        self._cursor = iter(sets)
+        for slides in self._cursor:
+            self += slides
+            if self.duration >= self.maxDuration + self.FILL_BUFFER:
+                break
+
+    def _pull(self):
+        for slides in self._cursor:
+            if slides not in self:
+                return slides
+        self._cursor = None
+        return None
+
+    def nextSet(self, restart):
+        """
+        Returns the next image set from the selection cursor that is not already queued.
+        When the cursor runs out the selection is restarted once from restart().
+        """
+        if self._cursor is not None:
+            slides = self._pull()
+            if slides:
+                return slides
+
+        self._cursor = iter(restart())
+        return self._pull()
+
     def __contains__(self, images):
-        paths = [i.path for i in self.queue]
-        if isinstance(images, list):
-            for i in images:
-                if i.path in paths:
-                    return True
-        else:
-            return images.path in paths
+        if not isinstance(images, list):
+            images = [images]
+
+        for i in images:
+            if i.path in self._paths or (i.setID is not None and i.setID in self._setIDs):
+                return True
 
         return False
 
@@ -163,6 +300,7 @@ class ImageQueue(PlayableQueue):
     def add(self, image):
         util.DEBUG_LOG(f"Adding image to queue: {image.path}")
         self.queue.append(image)
+        self._track([image])
         self.duration += image.duration  # Update the queue's duration
 
     def next(self, start=0, count=1, extend=False):
@@ -204,6 +342,7 @@ class ImageQueue(PlayableQueue):
 
         util.DEBUG_LOG('ImageQueue: {0} returned'.format(len(images)))
         self.queue += images
+        self._track(images)
         self.pos += 1
 
         return self.current()
@@ -552,34 +691,122 @@ class Goto(Playable):
         elif self['command'] == 'skip':
             return self['arg']        
         
-class FeatureHandler:
-    @DB.session
-    def getRatingBumper(self, sItem, feature, image=False):
+class Preflight:
+    """
+    Checks the files and directories a sequence refers to in parallel before the show starts, and keeps
+    the directory listings for the handlers.
+    """
+    WORKERS = 8
+    REMOTE_SCHEMES = ('plugin://', 'http://', 'https://')
+
+    def __init__(self):
+        self.listings = {}
+        self.filePaths = {}
+        self.missing = []
+
+    @staticmethod
+    def itemPaths(sItem):
+        """
+        Returns a list of (path, kind) referenced by sItem, where kind is 'dir' for directories listed by
+        name, 'files' for directories listed as file paths and 'file' for files.
+        """
+        itype = sItem._type
+        paths = []
+        if itype == 'video':
+            if sItem.vtype == 'dir':
+                paths.append((sItem.dir, 'dir'))
+            elif sItem.vtype == 'file':
+                paths.append((sItem.file, 'file'))
+            elif not sItem.random:
+                paths.append((sItem.source, 'file'))
+        elif itype == 'trailer':
+            source = sItem.getLive('source')
+            if source == 'dir':
+                paths.append((sItem.getLive('dir'), 'dir'))
+            elif source == 'file':
+                paths.append((sItem.getLive('file'), 'file'))
+        elif itype in ('trivia', 'slideshow'):
+            music = sItem.getLive('music')
+            if music == 'dir':
+                paths.append((sItem.getLive('musicDir'), 'files'))
+            elif music == 'file':
+                paths.append((sItem.getLive('musicFile'), 'file'))
+        elif itype == 'audioformat':
+            if 'af.file' in (sItem.getLive('method'), sItem.getLive('fallback')):
+                paths.append((sItem.getLive('file'), 'file'))
+        elif itype == 'action':
+            paths.append((sItem.file, 'file'))
+
+        return [(p, kind) for p, kind in paths if p and not p.startswith(Preflight.REMOTE_SCHEMES)]
+
+    def _check(self, job):
+        path, kind = job
         try:
-            if not feature.rating:
+            if kind == 'file':
+                return util.vfs.exists(path) or None
+            elif not util.vfs.exists(util.pathJoin(path, '')):
                 return None
+            elif kind == 'dir':
+                return util.vfs.listdir(path)
+            return util.listFilePaths(path)
+        except Exception:
+            util.ERROR()
+            return None
 
-            if sItem.getLive('ratingStyleSelection') == 'style':
-                return DB.RatingsBumpers.select().where(
-                    (DB.RatingsBumpers.system == feature.rating.system) &
-                    (DB.RatingsBumpers.name == feature.rating.name) &
-                    (DB.RatingsBumpers.isImage == image) &
-                    (DB.RatingsBumpers.style == sItem.getLive('ratingStyle'))
-                )[0]
+    def run(self, sItems):
+        """
+        Checks and lists every path referenced by the enabled items in sItems. Returns a list of (sItem, path)
+        for the paths that are missing.
+        """
+        jobs = {}
+        for sItem in sItems:
+            if not sItem.enabled:
+                continue
+            for job in self.itemPaths(sItem):
+                jobs.setdefault(job, []).append(sItem)
 
-            else:
-                return random.choice(
-                    [
-                        x for x in DB.RatingsBumpers.select().where(
-                            (DB.RatingsBumpers.system == feature.rating.system) &
-                            (DB.RatingsBumpers.name == feature.rating.name) &
-                            (DB.RatingsBumpers.isImage == image)
-                        )
-                    ]
-                )
-        except IndexError:
+        if not jobs:
+            return self.missing
+
+        start = time.time()
+        with concurrent.futures.ThreadPoolExecutor(min(self.WORKERS, len(jobs))) as executor:
+            results = list(executor.map(self._check, list(jobs)))
+
+        for (path, kind), result in zip(jobs, results):
+            if result is None:
+                for sItem in jobs[(path, kind)]:
+                    self.missing.append((sItem, path))
+                    util.LOG('Preflight: [{0}] ({1}) missing: {2}'.format(sItem.typeChar, util.strRepr(sItem.display()), util.strRepr(path)))
+            elif kind == 'dir':
+                self.listings[path] = result
+            elif kind == 'files':
+                self.filePaths[path] = result
+
+        util.DEBUG_LOG('Preflight: checked {0} paths in {1:.2f}s - {2} missing'.format(len(jobs), time.time() - start, len(self.missing)))
+        return self.missing
+
+    def listdir(self, path):
+        if path not in self.listings:
+            self.listings[path] = util.vfs.listdir(path)
+        return self.listings[path]
+
+    def listFilePaths(self, path):
+        if path not in self.filePaths:
+            self.filePaths[path] = util.listFilePaths(path)
+        return self.filePaths[path]
+
+
+class FeatureHandler:
+    def getRatingBumper(self, sItem, feature, image=False):
+        if not feature.rating:
             return None
 
+        style = None
+        if sItem.getLive('ratingStyleSelection') == 'style':
+            style = sItem.getLive('ratingStyle')
+
+        return DB.bumperCatalog().ratingBumper(feature.rating.system, feature.rating.name, image, style)
+
     def __call__(self, caller, sItem):
         count = sItem.getLive('count')
 
@@ -597,30 +824,30 @@ class FeatureHandler:
             if mediaType == 'video':
                 bumper = self.getRatingBumper(sItem, f)
                 if bumper:
-                    playables.append(Video(bumper.path, volume=sItem.getLive('volume')).fromModule(sItem))
-                    util.DEBUG_LOG('    - Video Rating: {0}'.format(repr(bumper.path)))
+                    playables.append(Video(bumper, volume=sItem.getLive('volume')).fromModule(sItem))
+                    util.DEBUG_LOG('    - Video Rating: {0}'.format(repr(bumper)))
             if mediaType == 'image' or mediaType == 'video' and not bumper:
                 bumper = self.getRatingBumper(sItem, f, image=True)
                 if bumper:
-                    playables.append(Image(bumper.path, duration=8, fade=1000).fromModule(sItem))
-                    util.DEBUG_LOG('    - Image Rating: {0}'.format(repr(bumper.path)))
+                    playables.append(Image(bumper, duration=8, fade=1000).fromModule(sItem))
+                    util.DEBUG_LOG('    - Image Rating: {0}'.format(repr(bumper)))
             playables.append(f)
             
         return playables
 
 class TriviaHandler:
     def __init__(self):
-        pass
+        self.caller = None
 
     def __call__(self, caller, sItem):
+        self.caller = caller
         duration = sItem.getLive('duration')
         util.DEBUG_LOG('[{0}] {1}m'.format(sItem.typeChar, duration))
         queue = ImageQueue(self, sItem).fromModule(sItem)
         queue.transition = sItem.getLive('transition')
         queue.transitionDuration = sItem.getLive('transitionDuration')
 
-        for slides in self.getTriviaImages(sItem):
-            queue += slides
+        queue.fill(self.getTriviaImages(sItem))
 
         ret = []
 
@@ -637,43 +864,28 @@ class TriviaHandler:
         if mode == 'off':
             return
 
+        rotation = musicRotation()
         if mode == 'content':
-            queue.music = [Song(s.path, s.duration) for s in DB.Song.select().order_by(DB.fn.Random())]
+            queue.music = rotation.songs(
+                'content', DB.changeCounter('music'),
+                lambda: [(s.path, s.duration) for s in DB.Song.select(DB.Song.path, DB.Song.duration)],
+                queue.duration
+            )
         elif mode == 'dir':
             path = sItem.getLive('musicDir')
             if not path:
                 return
 
-            import mutagen
-            mutagen.setFileOpener(util.vfs.File)
-
-            queue.music = []
-            for p in util.listFilePaths(path):
-                try:
-                    data = mutagen.File(p)
-                except:
-                    data = None
-                    util.ERROR()
-
-                d = 0
-                if data:
-                    d = data.info.length
-                queue.music.append(Song(p, d))
-
-            random.shuffle(queue.music)
+            paths = [p for p in self.caller.preflight.listFilePaths(path) if os.path.splitext(p)[-1].lower() in util.musicExtensions]
+            queue.music = rotation.songs('dir:' + path, rotation.listingStamp(paths), lambda: [(p, None) for p in paths], queue.duration)
         elif mode == 'file':
             path = sItem.getLive('musicFile')
             if not path:
                 return
 
-            import mutagen
-            mutagen.setFileOpener(util.vfs.File)
+            queue.music = [Song(path, rotation.duration(path))]
 
-            data = mutagen.File(path)
-            d = 0
-            if data:
-                d = data.info.length
-            queue.music = [Song(path, d)]
+        rotation.save()
 
         duration = sum([s.duration for s in queue.music])
 
@@ -690,35 +902,16 @@ class TriviaHandler:
         queue.musicFadeIn = util.getSettingDefault('trivia.musicFadeIn')
         queue.musicFadeOut = util.getSettingDefault('trivia.musicFadeOut')
 
-    @DB.session
-    
-    def extract_directory(path):
-        util.DEBUG_LOG('Content Full Path: {0}'.format(path))
-        if '@' in path:
-            result = path.split('@')[1]
-        elif '//' in path:
-            result = path.rsplit('//', 1)[1]
-        else:
-            result = path
-        return result
-        
-    def getTriviaImages(self, sItem): 
+    def getTriviaImages(self, sItem):
         util.DEBUG_LOG('Select Trivia : {0}'.format(sItem.getLive('triviaSelect')))
+        where = []
         if sItem.getLive('triviaSelect') == 'Directory':
-            triviadirectory = TriviaHandler.extract_directory(sItem.getLive('triviaDir'))
-            contentPath = util.getSettingDefault('content.path')
-            contentPath = TriviaHandler.extract_directory(contentPath) + 'Trivia/'
+            basePath = util.pathJoin(util.getSettingDefault('content.path'), 'Trivia')
+            pack = util.relativePath(sItem.getLive('triviaDir'), basePath)
+            util.DEBUG_LOG('Trivia Pack: {0}'.format(pack))
+            if pack:
+                where.append(DB.packWhere(DB.Trivia, pack))
 
-            util.DEBUG_LOG('Content Full Path: {0}'.format(contentPath))
-            util.DEBUG_LOG('Trivia Full Directory: {0}'.format(triviadirectory))
-
-            triviadirectory = triviadirectory.replace(contentPath, '')
-            util.DEBUG_LOG('Final Trivia Directory: {0}'.format(triviadirectory))
-            
-        else:
-            triviadirectory = ''
-            util.DEBUG_LOG('Final Trivia Directory: {0}'.format(triviadirectory))
-        
         clue = sItem.getLive('cDuration')
         durations = (
             sItem.getLive('aDuration'),
@@ -729,13 +922,13 @@ class TriviaHandler:
         trivia_refresh_period = datetime.datetime.now() - datetime.timedelta(days=30)
         util.DEBUG_LOG('Trivia Refresh Time: {0}'.format(trivia_refresh_period))
 
-        for trivia in DB.Trivia.select().where(DB.Trivia.accessed < trivia_refresh_period).order_by(DB.fn.Random()):
-            if triviadirectory in str(trivia.answerPath):
-                yield self.createTriviaImages(sItem, trivia, durations)
+        for trivia in DB.RandomSampler(DB.Trivia, DB.Trivia.accessed < trivia_refresh_period, *where):
+            yield self.createTriviaImages(sItem, trivia, durations)
 
         # Grab the oldest 4 trivias, shuffle and yield... repeat
+        # Loaded up front: the queue may resume this on another thread, which can't use this one's cursor
         pool = []
-        for trivia in DB.Trivia.select().where(DB.Trivia.accessed >= trivia_refresh_period).order_by(DB.Trivia.accessed):
+        for trivia in list(DB.Trivia.select().where(DB.Trivia.accessed >= trivia_refresh_period, *where).order_by(DB.Trivia.accessed)):
             pool.append(trivia)
 
             if len(pool) > 3:
@@ -769,30 +962,24 @@ class TriviaHandler:
         return slides
 
     def next(self, image_queue):
-        for slides in self.getTriviaImages(image_queue.sItem):
-            if slides not in image_queue:
-                return slides
-        return None
+        return image_queue.nextSet(lambda: self.getTriviaImages(image_queue.sItem))
 
-    @DB.session
-    def mark(self, image):        
-        trivia = DB.Trivia.get(TID=image.setID)  
-        trivia.accessed = datetime.datetime.now()
-        trivia.save()
+    def mark(self, image):
+        DB.writeQueue().update(DB.Trivia, DB.Trivia.TID, image.setID, accessed=datetime.datetime.now())
 
 class SlideshowHandler:
     def __init__(self):
-        pass
+        self.caller = None
     
     def __call__(self, caller, sItem):
+        self.caller = caller
         duration = sItem.getLive('duration')     
         util.DEBUG_LOG('[{0}] {1}'.format(sItem.typeChar, duration))
         queue = ImageQueue(self, sItem).fromModule(sItem)
         queue.transition = sItem.getLive('transition')
         queue.transitionDuration = sItem.getLive('transitionDuration')
 
-        for slides in self.getSlideshowImages(sItem):
-            queue += slides
+        queue.fill(self.getSlideshowImages(sItem))
 
         ret = []
 
@@ -809,43 +996,28 @@ class SlideshowHandler:
         if mode == 'off':
             return
 
+        rotation = musicRotation()
         if mode == 'content':
-            queue.music = [Song(s.path, s.duration) for s in DB.Song.select().order_by(DB.fn.Random())]
+            queue.music = rotation.songs(
+                'content', DB.changeCounter('music'),
+                lambda: [(s.path, s.duration) for s in DB.Song.select(DB.Song.path, DB.Song.duration)],
+                queue.duration
+            )
         elif mode == 'dir':
             path = sItem.getLive('musicDir')
             if not path:
                 return
 
-            import mutagen
-            mutagen.setFileOpener(util.vfs.File)
-
-            queue.music = []
-            for p in util.listFilePaths(path):
-                try:
-                    data = mutagen.File(p)
-                except:
-                    data = None
-                    util.ERROR()
-
-                d = 0
-                if data:
-                    d = data.info.length
-                queue.music.append(Song(p, d))
-
-            random.shuffle(queue.music)
+            paths = [p for p in self.caller.preflight.listFilePaths(path) if os.path.splitext(p)[-1].lower() in util.musicExtensions]
+            queue.music = rotation.songs('dir:' + path, rotation.listingStamp(paths), lambda: [(p, None) for p in paths], queue.duration)
         elif mode == 'file':
             path = sItem.getLive('musicFile')
             if not path:
                 return
 
-            import mutagen
-            mutagen.setFileOpener(util.vfs.File)
+            queue.music = [Song(path, rotation.duration(path))]
 
-            data = mutagen.File(path)
-            d = 0
-            if data:
-                d = data.info.length
-            queue.music = [Song(path, d)]
+        rotation.save()
 
         duration = sum([s.duration for s in queue.music])
 
@@ -872,42 +1044,23 @@ class SlideshowHandler:
             sDuration
         )
         
+        where = []
         if sItem.getLive('slideshowSelect') == 'Directory':
-            slideshowdirectory = SlideshowHandler.extract_directory(sItem.getLive('slideshowDir'))
-            contentPath = util.getSettingDefault('content.path')
-            contentPath = SlideshowHandler.extract_directory(contentPath) + 'Slideshow/'
-
-            util.DEBUG_LOG('Content Full Path: {0}'.format(contentPath))
-            util.DEBUG_LOG('Slideshow Full Directory: {0}'.format(slideshowdirectory))
-
-            slideshowdirectory = slideshowdirectory.replace(contentPath, '')
-            util.DEBUG_LOG('Final Slideshow Directory: {0}'.format(slideshowdirectory))
-            
-            if slideshow_order == 'Alphabetical':
-                for slidesimages in DB.Slideshow.select().where(DB.Slideshow.slidePath.contains(slideshowdirectory)).order_by(DB.Slideshow.slidePath):
-                    yield self.createSlideshowImages(sItem, slidesimages, durations)
-            elif slideshow_order == 'Random':
-                for slidesimages in DB.Slideshow.select().where(DB.Slideshow.slidePath.contains(slideshowdirectory)).order_by(DB.fn.Random()):
-                    yield self.createSlideshowImages(sItem, slidesimages, durations)            
-        else:
-            slideshowdirectory = ''
-            util.DEBUG_LOG('Final Slideshow Directory: {0}'.format(slideshowdirectory))                   
-            if slideshow_order == 'Alphabetical':
-                for slidesimages in DB.Slideshow.select().order_by(DB.Slideshow.slidePath):
-                    yield self.createSlideshowImages(sItem, slidesimages, durations)
-            elif slideshow_order == 'Random':
-                for slidesimages in DB.Slideshow.select().order_by(DB.fn.Random()):
-                    yield self.createSlideshowImages(sItem, slidesimages, durations)
-
-    def extract_directory(path):
-        util.DEBUG_LOG('Content Full Path: {0}'.format(path))
-        if '@' in path:
-            result = path.split('@')[1]
-        elif '//' in path:
-            result = path.rsplit('//', 1)[1]
-        else:
-            result = path
-        return result
+            basePath = util.pathJoin(util.getSettingDefault('content.path'), 'Slideshow')
+            pack = util.relativePath(sItem.getLive('slideshowDir'), basePath)
+            util.DEBUG_LOG('Slideshow Pack: {0}'.format(pack))
+            if pack:
+                where.append(DB.packWhere(DB.Slideshow, pack))
+
+        if slideshow_order == 'Alphabetical':
+            query = DB.Slideshow.select()
+            if where:
+                query = query.where(*where)
+            for slidesimages in list(query.order_by(DB.Slideshow.slidePath)):  # See getTriviaImages
+                yield self.createSlideshowImages(sItem, slidesimages, durations)
+        elif slideshow_order == 'Random':
+            for slidesimages in DB.RandomSampler(DB.Slideshow, *where):
+                yield self.createSlideshowImages(sItem, slidesimages, durations)
 
     def createSlideshowImages(self, sItem, slidesimages, durations):
         paths = [slidesimages.slidePath]
@@ -928,10 +1081,7 @@ class SlideshowHandler:
         return slides
 
     def next(self, image_queue):
-        for slides in self.getSlideshowImages(image_queue.sItem):
-            if slides not in image_queue:
-                return slides
-        return None
+        return image_queue.nextSet(lambda: self.getSlideshowImages(image_queue.sItem))
         
     def mark(self, image):
         return None
@@ -988,31 +1138,29 @@ class TrailerHandler:
 
         if self.sItem.getLive('order') == 'newest':
             util.DEBUG_LOG('    - Order: Newest')
-            orderby = [
+            trailers = DB.Trailers.select().where(*where).order_by(
                 DB.Trailers.release.desc(),
                 DB.Trailers.date
-            ]
+            )
         else:
             util.DEBUG_LOG('    - Order: Random')
-            orderby = [
-                DB.fn.Random()
-            ]
+            trailers = DB.RandomSampler(DB.Trailers, *where)
 
         if ratingLimitMethod and ratingLimitMethod != 'none':
             if ratingLimitMethod == 'max':
                 maxr = ratings.getRating(self.sItem.getLive('ratingMax').replace('.', ':', 1))
-                for t in DB.Trailers.select().where(*where).order_by(*orderby):
+                for t in trailers:
                     if ratings.getRating(t.rating).value <= maxr.value:
                         yield t
             elif self.caller.ratings:
                 minr = min(self.caller.ratings, key=lambda x: x.value)
                 maxr = max(self.caller.ratings, key=lambda x: x.value)
 
-                for t in DB.Trailers.select().where(*where).order_by(*orderby):
+                for t in trailers:
                     if minr.value <= ratings.getRating(t.rating).value <= maxr.value:
                         yield t
         else:
-            for t in DB.Trailers.select().where(*where).order_by(*orderby):
+            for t in trailers:
                 yield t
 
     def _getTrailersFromDBGenre(self, source, watched=False):
@@ -1095,7 +1243,7 @@ class TrailerHandler:
             t.date = datetime.datetime.now()
         t.url = url
         t.broken = not url
-        t.save()
+        DB.writeQueue().update(DB.Trailers, DB.Trailers.WID, t.WID, watched=t.watched, date=t.date, url=t.url, broken=t.broken)
         if not t.broken:
             util.DEBUG_LOG(
                 '    - {0}: {1} ({2:%Y-%m-%d}){3}'.format(repr(t.title).lstrip('u').strip("'"), t.rating, t.release, watched and ' - WATCHED' or '')
@@ -1124,7 +1272,8 @@ class TrailerHandler:
                 except DB.peewee.DoesNotExist:
                     ct += 1
                     url = t.getStaticURL()
-                    DB.Trailers.create(
+                    DB.createRow(
+                        DB.Trailers,
                         WID=t.ID,
                         source=source,
                         watched=False,
@@ -1171,7 +1320,7 @@ class TrailerHandler:
             return []
 
         try:
-            files = [f for f in util.vfs.listdir(path) if os.path.splitext(f)[-1].lower() in util.videoExtensions]
+            files = [f for f in self.caller.preflight.listdir(path) if os.path.splitext(f)[-1].lower() in util.videoExtensions]
             files = random.sample(files, min((count, len(files))))
             [util.DEBUG_LOG('    - Using: {0}'.format(repr(f))) for f in files] or util.DEBUG_LOG('    - No matching files')
             return [Video(util.pathJoin(path, p), volume=sItem.getLive('volume')).fromModule(sItem) for p in files]
@@ -1244,15 +1393,13 @@ class VideoBumperHandler:
 
         return playables
 
-    @DB.session
     def defaultHandler(self, sItem):
 
         if sItem.random:
             util.DEBUG_LOG('    - Random')
 
-            bumpers = [x for x in DB.VideoBumpers.select().where((DB.VideoBumpers.type == sItem.vtype))]
-            bumpers = random.sample(bumpers, min(sItem.count, len(bumpers)))
-            bumpers = [Video(bumper.path, volume=sItem.getLive('volume')).fromModule(sItem) for bumper in bumpers]
+            bumpers = DB.bumperCatalog().videoBumpers(sItem.vtype, sItem.count)
+            bumpers = [Video(bumper, volume=sItem.getLive('volume')).fromModule(sItem) for bumper in bumpers]
 
             if not bumpers:
                 util.DEBUG_LOG('    - No matches! Using default YouTube link.')
@@ -1327,7 +1474,7 @@ class VideoBumperHandler:
             return []
 
         try:
-            files = util.vfs.listdir(sItem.dir)
+            files = list(self.caller.preflight.listdir(sItem.dir))
             if sItem.random:
                 files = random.sample(files, min((sItem.count, len(files))))
             else:
@@ -1374,7 +1521,6 @@ class AudioFormatHandler:
             )
             return feature.audioFormat
 
-    @DB.session
     def __call__(self, caller, sItem):
         bumper = None
         method = sItem.getLive('method')
@@ -1387,14 +1533,10 @@ class AudioFormatHandler:
             util.DEBUG_LOG('    - Detect')
             audioFormat = self._checkFileNameForFormat(caller.nextQueuedFeature)
             if audioFormat:
-                try:
-                    bumper = random.choice(
-                        [x for x in DB.AudioFormatBumpers.select().where(
-                            (DB.AudioFormatBumpers.format == audioFormat)
-                        )]
-                    )
+                bumper = DB.bumperCatalog().audioFormatBumper(audioFormat)
+                if bumper:
                     util.DEBUG_LOG('    - Detect: Using bumper based on feature codec info ({0})'.format(repr(caller.nextQueuedFeature.title)))
-                except IndexError:
+                else:
                     util.DEBUG_LOG('    - Detect: No codec matches!')
             else:
                 util.DEBUG_LOG('    - No feature audio format!')
@@ -1407,14 +1549,10 @@ class AudioFormatHandler:
             )
         ):
             util.DEBUG_LOG('    - Format')
-            try:
-                bumper = random.choice(
-                    [x for x in DB.AudioFormatBumpers.select().where(
-                        (DB.AudioFormatBumpers.format == format_)
-                    )]
-                )
+            bumper = DB.bumperCatalog().audioFormatBumper(format_)
+            if bumper:
                 util.DEBUG_LOG('    - Format: Using bumper based on setting ({0})'.format(repr(caller.nextQueuedFeature.title)))
-            except IndexError:
+            else:
                 util.DEBUG_LOG('    - Format: No matches!')
         if (
             sItem.getLive('file') and not bumper and (
@@ -1427,7 +1565,7 @@ class AudioFormatHandler:
             return [Video(sItem.getLive('file'), volume=sItem.getLive('volume')).fromModule(sItem)]
 
         if bumper:
-            return [Video(bumper.path, volume=sItem.getLive('volume')).fromModule(sItem)]
+            return [Video(bumper, volume=sItem.getLive('volume')).fromModule(sItem)]
             
         if not bumper:
             util.DEBUG_LOG('    - No bumper found. Checking for default YouTube link.')
@@ -1459,35 +1597,46 @@ class ActionHandler:
 class SequenceProcessor:
     def __init__(self, sequence_path, db_path=None, content_path=None):
         DB.initialize(db_path)
-        self.pos = -1
-        self.size = 0
-        self.sequence = []
-        self.featureQueue = []
-        self.playables = []
-        self.genres = []
-        self.contentPath = content_path
-        self.lastFeature = None
-        self._lastAction = None
-        self.end = -1
-        self.loadSequence(sequence_path)
-        self.createDefaultFeature()
-
-        self.beginningAction = None
-        self.PreshowBeginningAction = None
-        self.initialize_beginning_action()        
+        DB.pinSnapshot()
+        try:
+            self.pos = -1
+            self.size = 0
+            self.sequence = []
+            self.featureQueue = []
+            self.playables = []
+            self.genres = []
+            self.contentPath = content_path
+            self.lastFeature = None
+            self._lastAction = None
+            self.end = -1
+            self.indexPlayables([])
+            self.preflight = Preflight()
+            self.loadSequence(sequence_path)
+            self.createDefaultFeature()
+
+            self.beginningAction = None
+            self.PreshowBeginningAction = None
+            self.initialize_beginning_action()
+        except:
+            # The caller never gets a processor to close
+            DB.releaseSnapshot()
+            raise
    
     def initialize_beginning_action(self):
-        addon = xbmcaddon.Addon()
-        PreshowBeginning = addon.getSetting('action.PreshowBeginning')
+        PreshowBeginning = util.getSettingDefault('action.PreshowBeginning')
         #util.DEBUG_LOG('PreshowBeginning Status: {0}'.format(repr(PreshowBeginning)))
-        if PreshowBeginning == 'true':
-            actionFile = addon.getSetting('action.PreshowBeginning.file')
+        if PreshowBeginning is True:
+            actionFile = xbmcaddon.Addon().getSetting('action.PreshowBeginning.file')
             if actionFile:
                 self.PreshowBeginningAction = actions.ActionFileProcessor(actionFile) 
                 self.PreshowBeginningAction.run()                
                 util.DEBUG_LOG(f"Start of PreShow Action loaded from file: {actionFile}")
                 #xbmc.sleep(5000)
       
+    def close(self):
+        DB.flushWrites()
+        DB.releaseSnapshot()
+
     def atEnd(self, pos=None):
         if pos is None:
             pos = self.pos
@@ -1553,7 +1702,34 @@ class SequenceProcessor:
         'command': commandHandler
     }
 
-    def process(self):
+    # Modules whose handlers only read the processor's state. Each lane runs on its own thread while the
+    # rest of the sequence is walked; modules sharing a lane share handler state and run in sequence order.
+    PARALLEL_LANES = {
+        'trivia': 'images',
+        'slideshow': 'images',
+        'trailer': 'trailer',
+        'video': 'video'
+    }
+
+    def view(self):
+        """
+        Returns a copy of the processor with the feature queue as it is now, for handlers run in a lane.
+        """
+        view = copy.copy(self)
+        view.featureQueue = list(self.featureQueue)
+        return view
+
+    def processLane(self, handler, sItem):
+        """
+        Runs a handler on a lane thread. Handlers return loaded playables, so the lane's own connection is
+        closed when it is done (the snapshot keeps its connections, as closing would discard the copy).
+        """
+        try:
+            return handler(self, sItem)
+        finally:
+            DB.close()
+
+    def process(self, parallel=True):
         util.DEBUG_LOG('Processing sequence...')
         util.DEBUG_LOG('Feature count: {0}'.format(len(self.featureQueue)))
         util.DEBUG_LOG('Ratings: {0}'.format(', '.join([str(r) for r in self.ratings])))
@@ -1564,40 +1740,105 @@ class SequenceProcessor:
         else:
             util.DEBUG_LOG('NO FEATURES QUEUED')
 
-        self.playables = []
+        self.preflight.run(self.sequence)
+
+        start = time.time()
+        if parallel:
+            DB.bumperCatalog()  # Built here once, rather than by a lane and this thread at the same time
+
+        lanes = {}
+        results = []
         pos = 0
-        while pos < len(self.sequence):
-            sItem = self.sequence[pos]
+        try:
+            while pos < len(self.sequence):
+                sItem = self.sequence[pos]
+
+                if not sItem.enabled:
+                    util.DEBUG_LOG('[{0}] ({1}) DISABLED'.format(sItem.typeChar, repr(sItem.display())))
+                    pos += 1
+                    continue
+
+                handler = self.handlers.get(sItem._type)
+
+                if handler:
+                    if sItem._type == 'command':
+                        offset = handler(self, sItem)
+                        if type(offset) == int:
+                            pos += offset
+                            if offset:
+                                continue
+                        elif offset is not None:  # Add a check to ensure offset is not None
+                            results.append((pos, [offset]))
+                    elif parallel and sItem._type in self.PARALLEL_LANES:
+                        name = self.PARALLEL_LANES[sItem._type]
+                        if name not in lanes:
+                            lanes[name] = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='PreShowLane-' + name)
+                        results.append((pos, lanes[name].submit(self.view().processLane, handler, sItem)))
+                    else:
+                        results.append((pos, handler(self, sItem)))
 
-            if not sItem.enabled:
-                util.DEBUG_LOG('[{0}] ({1}) DISABLED'.format(sItem.typeChar, repr(sItem.display())))
                 pos += 1
-                continue
 
-            handler = self.handlers.get(sItem._type)
-
-            if handler:
-                if sItem._type == 'command':
-                    offset = handler(self, sItem)
-                    if type(offset) == int:
-                        pos += offset
-                        if offset:
-                            continue
-                    elif offset is not None:  # Add a check to ensure offset is not None
-                        offset.setFrom(pos)
-                        self.playables.append(offset)
-                else:
-                    playables = handler(self, sItem)
-                    for p in playables:
-                        if hasattr(p, 'setFrom'):
-                            p.setFrom(pos)
-                        self.playables.append(p)
+            self.playables = []
+            froms = []
+            for pos, playables in results:
+                if isinstance(playables, concurrent.futures.Future):
+                    playables = playables.result()
+
+                for p in playables:
+                    if hasattr(p, 'setFrom'):
+                        p.setFrom(pos)
+                    self.playables.append(p)
+                    froms.append(pos)
+        finally:
+            for lane in lanes.values():
+                lane.shutdown()
 
-            pos += 1
         self.playables.append(None)  # Keeps it from being empty until AFTER the last item
         self.end = len(self.playables) - 1
+        self.indexPlayables(froms)
+
+        util.DEBUG_LOG('Sequence processing finished ({0:.2f}s)'.format(time.time() - start))
+
+    def indexPlayables(self, froms):
+        """
+        Builds the tables the playback cursor uses to find the next feature, the next item to show,
+        the previous non-action item and the first item of a sequence position without scanning.
+        froms holds the sequence position of each playable before the None terminator.
+        """
+        size = len(self.playables)
+        self._upNext = [0] * size
+        self._nextFeature = [None] * size
+        self._prevPlayable = [0] * size
+        self._firstAt = [None] * len(self.sequence)
+
+        nextFeature = None
+        for i in range(size - 1, -1, -1):
+            p = self.playables[i]
+            if self.atEnd(i) or not p or p.type not in ('ACTION', 'COMMAND', 'GOTO'):
+                self._upNext[i] = i
+            else:
+                self._upNext[i] = self._upNext[i + 1]
+
+            if p and p.type == 'FEATURE' and i < size - 1:
+                nextFeature = i
+            self._nextFeature[i] = nextFeature
+
+        for i, p in enumerate(self.playables):
+            if i and p and p.type == 'ACTION':
+                self._prevPlayable[i] = self._prevPlayable[i - 1]
+            else:
+                self._prevPlayable[i] = i
 
-        util.DEBUG_LOG('Sequence processing finished')
+        for i in range(len(froms) - 1, -1, -1):
+            if 0 <= froms[i] < len(self._firstAt):
+                self._firstAt[froms[i]] = i
+        for pos in range(len(self._firstAt) - 2, -1, -1):
+            after = self._firstAt[pos + 1]
+            if after is not None and (self._firstAt[pos] is None or after < self._firstAt[pos]):
+                self._firstAt[pos] = after
+
+        self._froms = froms
 
     def loadSequence(self, sequence_path):
         self.sequence = sequence.loadSequence(sequence_path)
@@ -1637,53 +1878,36 @@ class SequenceProcessor:
         if self.pos > 0:
             self.pos -= 1
 
-        playable = self.playables[self.pos]
-
-        while playable.type == 'ACTION' and self.pos > 0:
-            self.pos -= 1
-            playable = self.playables[self.pos]
-
-        return playable
+        self.pos = self._prevPlayable[self.pos]
+        return self.playables[self.pos]
 
     def upNext(self):
         if self.atEnd():
             return None
 
-        pos = self.pos + 1
-        playable = self.playables[pos]
-        while not self.atEnd(pos) and playable and playable.type in ('ACTION', 'COMMAND', 'GOTO'):
-            pos += 1
-            playable = self.playables[pos]
-        else:
-            return playable
-
-        return None
+        return self.playables[self._upNext[self.pos + 1]]
 
     def nextFeature(self):
-        for i in range(self.pos + 1, len(self.playables) - 1):
-            p = self.playables[i]
-            if p.type == 'FEATURE':
-                return p
-        return None
+        if self.pos + 1 >= len(self._nextFeature):
+            return None
+
+        i = self._nextFeature[self.pos + 1]
+        return i is not None and self.playables[i] or None
 
     def lastAction(self):
         return self._lastAction
         
     def seekToFirstPlayableAtOffset(self, offset):
-        pos = self.playables[self.pos]['from']
+        pos = self._froms[self.pos]
         pos += offset
         if pos < 0:
             pos = 0
         if pos > len(self.sequence) - 1:
             return None
-        
-        i = 0
-        for p in self.playables:
-            if p['from'] >= pos:
-                self.pos = i - 1 # Position before the item that we want to go next as function next() will be called
-                if self.pos < 0:
-                    self.pos = 0
-                return p
-            i += 1
-                
-        return None
+
+        i = self._firstAt[pos]
+        if i is None:
+            return None
+
+        self.pos = max(i - 1, 0)  # Position before the item that we want to go next as function next() will be called
+        return self.playables[i]
@@ -95,6 +95,7 @@ try:
     import xbmcaddon
     import stat
     import time
+    from resources.lib import kodiutil
 
     STORAGE_PATH = xbmcvfs.translatePath(xbmcaddon.Addon().getAddonInfo('profile'))
     _T = xbmcaddon.Addon().getLocalizedString
@@ -191,41 +192,31 @@ try:
                 xbmc.sleep(100)
             return xbmc.Monitor().abortRequested()
 
-    def getSettingDefault(key):
-        default = xbmcaddon.Addon().getSetting(key)
+    SETTING_ENUMS = {
+        'trailer.source': ('content', 'dir', 'file'),
+        'trailer.ratingLimit': ('none', 'max', 'match'),
+        'trailer.order': ('newest', 'random'),
+        'trivia.music': ('off', 'content', 'dir', 'file'),
+        'slideshow.format': ('slide', 'video'),
+        'slideshow.music': ('off', 'content', 'dir', 'file'),
+        'audioformat.method': ('af.detect', 'af.format', 'af.file'),
+        'audioformat.fallback': ('af.format', 'af.file'),
+        'trivia.transition': ('none', 'fade', 'slideL', 'slideR', 'slideU', 'slideD'),
+        'slideshow.transition': ('none', 'fade', 'slideL', 'slideR', 'slideU', 'slideD'),
+        'audioformat.format': (
+            'Auro-3D', 'Dolby Digital', 'Dolby Digital Plus', 'Dolby TrueHD',
+            'Dolby Atmos', 'DTS', 'DTS-HD Master Audio', 'DTS-X', 'Datasat', 'THX', 'Other'
+        ),
+        'feature.ratingBumper': ('none', 'video', 'image'),
+        'feature.ratingStyleSelection': ('random', 'style')
+    }
 
+    def _decodeSetting(key, default):
         if default == '':
             return _getSettingDefault(key)
 
-        if key == 'trailer.source':
-            return ['content', 'dir', 'file'][int(default)]
-        elif key == 'trailer.ratingLimit':
-            return ['none', 'max', 'match'][int(default)]
-        elif key == 'trailer.order':
-            return ['newest', 'random'][int(default)]
-        elif key == 'trivia.music':
-            return ['off', 'content', 'dir', 'file'][int(default)]
-        elif key == 'slideshow.format':
-            return ['slide', 'video'][int(default)]
-        elif key == 'slideshow.music':
-            return ['off', 'content', 'dir', 'file'][int(default)]
-        elif key == 'audioformat.method':
-            return ['af.detect', 'af.format', 'af.file'][int(default)]
-        elif key == 'audioformat.fallback':
-            return ['af.format', 'af.file'][int(default)]
-        elif key == 'trivia.transition':
-            return ['none', 'fade', 'slideL', 'slideR', 'slideU', 'slideD'][int(default)]
-        elif key == 'slideshow.transition':
-            return ['none', 'fade', 'slideL', 'slideR', 'slideU', 'slideD'][int(default)]
-        elif key == 'audioformat.format':
-            return [
-                'Auro-3D', 'Dolby Digital', 'Dolby Digital Plus', 'Dolby TrueHD',
-                'Dolby Atmos', 'DTS', 'DTS-HD Master Audio', 'DTS-X', 'Datasat', 'THX', 'Other'
-            ][int(default)]
-        elif key == 'feature.ratingBumper':
-            return ['none', 'video', 'image'][int(default)]
-        elif key == 'feature.ratingStyleSelection':
-            return ['random', 'style'][int(default)]
+        if key in SETTING_ENUMS:
+            return SETTING_ENUMS[key][int(default)]
         elif default in ['true', 'false']:
             return default == 'true'
         elif default.isdigit():
@@ -238,6 +229,9 @@ try:
 
         return default
 
+    def getSettingDefault(key):
+        return _decodeSetting(key, kodiutil.getRawSetting(key))
+
     def contentScrapers():
         ret = []
         for stype, scraper, default in (
@@ -246,7 +240,7 @@ try:
             ('trailers', 'TMDB', True),
             ('trailers', 'Content', False)
         ):
-            sett = xbmcaddon.Addon().getSetting('scraper.{0}.{1}'.format(stype, scraper))
+            sett = kodiutil.getRawSetting('scraper.{0}.{1}'.format(stype, scraper))
             if sett in ('true', 'false'):
                 sett = sett == 'true'
             else:
@@ -357,6 +351,29 @@ def listFilePaths(path):
             ret.append(full)
     return ret
 
+def _normalizePath(path):
+    path = re.sub(r'^(\w+://)[^/@]*@', r'\1', path.replace('\\', '/'))
+    scheme, sep, rest = path.rpartition('://')
+    return scheme + sep + re.sub(r'/+', '/', rest).rstrip('/')
+
+def relativePath(path, base):
+    """
+    Returns path relative to base, '/' separated and without credentials or
+    repeated separators. If path is not under base, falls back to whatever follows
+    the last component of base found in path, or else to the full normalized path.
+    """
+    path = _normalizePath(path or '')
+    base = _normalizePath(base or '')
+    if path == base:
+        return ''
+    if path.startswith(base + '/'):
+        return path[len(base) + 1:]
+
+    marker = '/' + base.rsplit('/', 1)[-1] + '/'
+    if marker in path + '/':
+        return (path + '/').rsplit(marker, 1)[-1].rstrip('/')
+    return path
+
 def strRepr(str_obj):
     ret = repr(str_obj).lstrip('u')
     return ret.endswith('"') and ret.strip('"') or ret.strip("'")
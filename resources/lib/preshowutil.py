@@ -1,5 +1,7 @@
+import copy
 import os
 import re
+import pickle
 import requests
 import shutil
 import xbmc
@@ -88,29 +90,122 @@ def getSequencesContentPath():
 
     return contentPath
 
+SEQUENCE_INDEX_VERSION = 1
+_SEQUENCE_INDEX = None
+
+
+def _sequenceIndexPath():
+    return os.path.join(kodiutil.PROFILE_PATH, 'sequences.index')
+
+
+def _sequenceIndexKey(sequencesPath):
+    # Parsed rating conditions depend on the rating systems in the database
+    return (SEQUENCE_INDEX_VERSION, sequencesPath, preshowexperience.database.changeCounter('ratings'))
+
+
+def _loadSequenceIndex(key):
+    global _SEQUENCE_INDEX
+    if _SEQUENCE_INDEX and _SEQUENCE_INDEX['key'] == key:
+        return _SEQUENCE_INDEX['entries']
+
+    try:
+        with open(_sequenceIndexPath(), 'rb') as f:
+            data = pickle.load(f)
+    except (IOError, OSError):
+        return {}
+    except Exception:
+        kodiutil.ERROR('Bad sequence index')
+        return {}
+
+    if data.get('key') != key:
+        return {}
+
+    _SEQUENCE_INDEX = data
+    return data['entries']
+
+
+def _saveSequenceIndex(key, entries):
+    global _SEQUENCE_INDEX
+    _SEQUENCE_INDEX = {'key': key, 'entries': entries}
+    try:
+        with open(_sequenceIndexPath(), 'wb') as f:
+            pickle.dump(_SEQUENCE_INDEX, f, pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        kodiutil.ERROR('Failed to write sequence index')
+
+
+def _sequenceFileStamp(path):
+    st = preshowexperience.util.vfs.Stat(path)
+    return (st.st_mtime(), st.st_size())
+
+
+def getSequenceIndex(sequencesPath):
+    """
+    Returns a list of (path, SequenceData) for the sequences in sequencesPath. Entries hold the name, flags
+    and parsed conditions but no items, and files are only re-parsed when their mtime or size changes.
+    Files that failed to load are returned with None.
+    """
+    key = _sequenceIndexKey(sequencesPath)
+    entries = _loadSequenceIndex(key)
+
+    updated = {}
+    changed = False
+    for name in preshowexperience.util.vfs.listdir(sequencesPath):
+        if name.endswith(('.tmp', '.bak')):  # Left behind by an interrupted save
+            continue
+
+        p = preshowexperience.util.pathJoin(sequencesPath, name)
+        try:
+            stamp = _sequenceFileStamp(p)
+        except Exception:
+            stamp = None
+
+        entry = entries.get(p)
+        if stamp is None or not entry or entry[0] != stamp:
+            changed = True
+            try:
+                entry = (stamp, preshowexperience.sequence.SequenceData.load(p).indexEntry())
+            except Exception:
+                kodiutil.ERROR('Failed to load: {0}'.format(kodiutil.strRepr(p)))
+                entry = (stamp, None)
+
+        updated[p] = entry
+
+    if changed or len(updated) != len(entries):
+        _saveSequenceIndex(key, updated)
+
+    return [(p, updated[p][1]) for p in sorted(updated)]
+
+
 def getActiveSequences(active=True, for_dialog=False):
     contentPath = getSequencesContentPath()
     if not contentPath:
         return None
 
     sequencesPath = preshowexperience.util.pathJoin(contentPath, 'Sequences')
-    sequencePaths = [preshowexperience.util.pathJoin(sequencesPath, p) for p in preshowexperience.util.vfs.listdir(sequencesPath)]
 
     sequences = []
-    for p in sequencePaths:
-        try:
-            s = preshowexperience.sequence.SequenceData.load(p)
-            if not active or (s and s.active):
-                if not for_dialog or s.visibleInDialog():
-                    sequences.append(s)
-        except Exception:
-            kodiutil.ERROR('Failed to load: {0}'.format(kodiutil.strRepr(p)))
+    for p, s in getSequenceIndex(sequencesPath):
+        if not s:
+            continue
+        if not active or s.active:
+            if not for_dialog or s.visibleInDialog():
+                sequences.append(s)
 
     return sequences
 
-def getMatchedSequence(feature):
-    priority = ['featuretitle', 'ratings', 'videoaspect', 'tags', 'year', 'studio', 'director', 'actor', 'genre', 'dates', 'times']
+_SEQUENCE_MATCHER = None
 
+
+def getSequenceMatcher(sequences):
+    global _SEQUENCE_MATCHER
+    key = tuple(id(s) for s in sequences)
+    if not _SEQUENCE_MATCHER or _SEQUENCE_MATCHER[0] != key:
+        _SEQUENCE_MATCHER = (key, preshowexperience.sequence.SequenceMatcher(sequences))
+    return _SEQUENCE_MATCHER[1]
+
+
+def getMatchedSequence(feature):
     contentPath = getSequencesContentPath()
     if not contentPath:
         return getDefaultSequenceData(feature)
@@ -122,42 +217,29 @@ def getMatchedSequence(feature):
     if not sequences:
         return getDefaultSequenceData(feature)
 
-    out = 'Active sequences:\n'
-    for seq in sequences:
-        out += '{0}\n'.format(seq.conditionsStr())
-
-    kodiutil.DEBUG_LOG(out)
+    matcher = getSequenceMatcher(sequences)
 
-    matches = [[s, 0] for s in sequences]
-    for attr in priority:
-        for seq in matches[:]:
-            match = seq[0].matchesFeatureAttr(attr, feature)
-            if match >= 0:
-                seq[1] += match
-            else:
-                matches.remove(seq)
+    if kodiutil.DEBUG():
+        kodiutil.DEBUG_LOG('Matching {0} active sequences:\n{1}'.format(len(sequences), matcher.explain(feature)))
 
-        if not matches:
-            break
+    matches = matcher.match(feature)
 
     if matches:
-        out = 'MATCHES: '
-        out += ', '.join(['{0}({1})'.format(kodiutil.strRepr(m[0].name), m[1]) for m in matches])
-        kodiutil.DEBUG_LOG(out)
         seqData = max(matches, key=lambda x: x[1])[0]
     else:
         seqData = None
 
+    if not seqData:
+        return getDefaultSequenceData(feature)
+
     kodiutil.DEBUG_LOG('.')
     if seqData.name == '':
+        seqData = copy.copy(seqData)  # Keep the cached index entry as it was loaded
         seqData.name = 'default'
     kodiutil.DEBUG_LOG('CHOICE: {0}'.format(seqData.name))
     kodiutil.DEBUG_LOG('.')
     kodiutil.DEBUG_LOG(feature)
 
-    if not seqData:
-        return getDefaultSequenceData(feature)
-
     path = preshowexperience.util.pathJoin(sequencesPath, '{0}'.format(seqData.pathName))
     #kodiutil.DEBUG_LOG('getMatchedSequence Sequence Path: {0}'.format(repr(path)))
     return {'path': path, 'sequence': seqData}
@@ -205,6 +287,10 @@ def loadContent(from_settings=False, bg=False):
 
     createSettingsRSDirs()
     
+def maintainDatabase():
+    kodiutil.DEBUG_LOG('Running database maintenance...')
+    preshowexperience.database.maintain()
+
 def createSettingsRSDirs():
     base = os.path.join(kodiutil.PROFILE_PATH, 'settings', 'ratings')
     if not os.path.exists(base):
@@ -217,7 +303,7 @@ def createSettingsRSDirs():
 
     defaultSystem = kodiutil.getSetting('rating.system.default', 'MPAA')
 
-    for system in list(preshowexperience.ratings.RATINGS_SYSTEMS.values()):
+    for system in preshowexperience.ratings.ratingsSystems():
         systemPaths = [os.path.join(base, system.name)]
         if system.name == defaultSystem:
             systemPaths.append(defaultPath)
@@ -374,15 +460,63 @@ class RatingParser:
         'DEJUS': r'(?i)(?P<rating>Livre|10 Anos|12 Anos|14 Anos|16 Anos|18 Anos)'
     }
 
-    SYSTEM_RATING_REs.update(preshowexperience.ratings.getRegExs('kodi'))
-    RATING_REs.update(preshowexperience.ratings.getRegExs())
-
     LANGUAGE = xbmc.getLanguage(xbmc.ISO_639_1, region=True)
 
     def __init__(self):
         kodiutil.DEBUG_LOG('Language: {0}'.format(self.LANGUAGE))
+        self.SYSTEM_RATING_REs = dict(self.SYSTEM_RATING_REs, **preshowexperience.ratings.getRegExs('kodi'))
+        self.RATING_REs = dict(self.RATING_REs, **preshowexperience.ratings.getRegExs())
+        self.systemNames = list(self.SYSTEM_RATING_REs)
+        self.systemPattern = self._combine(self.SYSTEM_RATING_REs.values())
+        self.ratingPatterns = {}  # Default system -> combined pattern with the default system's pattern first
+        self._cache = {}
         self.setRatingDefaults()
 
+    @staticmethod
+    def _combine(patterns):
+        """
+        Joins patterns into one regex, matched at the start of a string, that takes the first pattern in the list
+        which is found anywhere in the string. Each pattern's alternative ends with an empty group, so the match's
+        lastindex tells which one matched. Returns the regex and {lastindex: (pattern index, rating group)}.
+        """
+        alternatives = []
+        for i, pattern in enumerate(patterns):
+            flags = re.match(r'\(\?([imsx]+)\)', pattern)
+            pattern = pattern[flags.end():] if flags else pattern
+            search = '' if pattern.startswith('^') else r'[\s\S]*?'  # Anchored patterns can only match here
+            pattern = pattern.replace('(?P<rating>', '(?P<rating{0}>'.format(i)).replace('(?P=rating)', '(?P=rating{0})'.format(i))
+            if flags:  # Scope the pattern's leading flags to its alternative
+                pattern = '(?{0}:{1})'.format(flags.group(1), pattern)
+            alternatives.append('(?={0}{1})(?P<pattern{2}>)'.format(search, pattern, i))
+
+        combined = re.compile('|'.join(alternatives))
+        groups = dict(
+            (combined.groupindex['pattern{0}'.format(i)], (i, combined.groupindex['rating{0}'.format(i)]))
+            for i in range(len(alternatives))
+        )
+        return combined, groups
+
+    @staticmethod
+    def _match(combined, rating):
+        """
+        Returns (pattern index, rating) for the first of the patterns from _combine() that matches rating, or None.
+        """
+        pattern, groups = combined
+        m = pattern.match(rating)
+        if not m:
+            return None
+        i, group = groups[m.lastindex]
+        return i, m.group(group)
+
+    def _ratingPattern(self, defaultSystem):
+        combined = self.ratingPatterns.get(defaultSystem)
+        if not combined:
+            patterns = list(self.RATING_REs.values())
+            if defaultSystem in self.RATING_REs:
+                patterns.insert(0, self.RATING_REs[defaultSystem])
+            combined = self.ratingPatterns[defaultSystem] = self._combine(patterns)
+        return combined
+
     def setRatingDefaults(self):
         ratingSystem = kodiutil.getSetting('rating.system.default', 'MPAA')
 
@@ -405,26 +539,28 @@ class RatingParser:
         if not rating:
             return 'UNKNOWN:NR'
 
+        key = (rating, preshowexperience.ratings.DEFAULT_RATING_SYSTEM)
+        if key not in self._cache:
+            if len(self._cache) > 1000:
+                self._cache.clear()
+            self._cache[key] = self._recognize(rating, key[1])
+
+        return self._cache[key]
+
+    def _recognize(self, rating, defaultSystem):
         # Try a definite match
-        for system, ratingRE in list(self.SYSTEM_RATING_REs.items()):
-            m = re.search(ratingRE, rating)
-            if m:
-                return '{0}:{1}'.format(system, m.group('rating'))
+        m = self._match(self.systemPattern, rating)
+        if m:
+            return '{0}:{1}'.format(self.systemNames[m[0]], m[1])
 
         rating = rating.upper().replace('RATED', '').strip(': ')
 
-        # Try to match against default system if set
-        defaultSystem = preshowexperience.ratings.DEFAULT_RATING_SYSTEM
-        if defaultSystem and defaultSystem in self.RATING_REs:
-            m = re.search(self.RATING_REs[defaultSystem], rating)
-            if m:
-                return '{0}:{1}'.format(defaultSystem, m.group('rating'))
-
-        # Try to extract rating from know ratings systems
-        for system, ratingRE in list(self.RATING_REs.items()):
-            m = re.search(ratingRE, rating)
-            if m:
-                return m.group('rating')
+        # Try the default system if set, then extract the rating from known ratings systems
+        m = self._match(self._ratingPattern(defaultSystem), rating)
+        if m:
+            if m[0] == 0 and defaultSystem in self.RATING_REs:
+                return '{0}:{1}'.format(defaultSystem, m[1])
+            return m[1]
 
         # Just return what we have
         return rating
@@ -1,6 +1,7 @@
 import time
 import xbmc
 import xbmcaddon
+import xbmcgui
 
 scriptAddon = xbmcaddon.Addon('script.preshowexperience')
 
@@ -10,6 +11,8 @@ def LOG(msg):
 class Service(xbmc.Monitor):
     def __init__(self):
         self._pollInterval = 300  # 5 minutes
+        self._maintenanceInterval = 7 * 86400  # 1 week
+        self._maintenanceIdleTime = 1800  # 30 minutes
         self.start()
 
     def start(self):
@@ -26,6 +29,9 @@ class Service(xbmc.Monitor):
             self.updateContent()
 
     def poll(self):
+        if self.maintainDatabase():
+            return  # Don't update while maintenance has the database
+
         try:
             interval = int(scriptAddon.getSetting('service.database.update.interval')) * 3600  # 1 hour
         except ValueError:
@@ -37,6 +43,20 @@ class Service(xbmc.Monitor):
         if now - last >= interval:
             self.updateContent()
 
+    def isIdle(self):
+        if xbmc.getGlobalIdleTime() < self._maintenanceIdleTime or xbmc.Player().isPlaying():
+            return False
+        return xbmcgui.Window(10025).getProperty('PreShowExperienceRunning') != 'True'
+
+    def maintainDatabase(self):
+        now = time.time()
+        if now - self.getSettingTime('service.maintenance.last') < self._maintenanceInterval or not self.isIdle():
+            return False
+
+        scriptAddon.setSetting('service.maintenance.last', str(int(now)))
+        xbmc.executebuiltin('RunScript(script.preshowexperience,maintain.database)')
+        return True
+
     def updateContent(self):
         self.markUpdateTime()
         xbmc.executebuiltin('RunScript(script.preshowexperience,update.database)')
@@ -46,8 +66,11 @@ class Service(xbmc.Monitor):
         scriptAddon.setSetting('service.update.last', str(now))
 
     def getUpdateTime(self):
+        return self.getSettingTime('service.update.last')
+
+    def getSettingTime(self, setting):
         try:
-            return int(scriptAddon.getSetting('service.update.last'))
+            return int(scriptAddon.getSetting(setting))
         except ValueError:
             return 0
 
@@ -15,6 +15,7 @@ from .preshowexperience import database as DB
 from .kodiutil import T
 
 def clearDBWatchedStatus():
+    DB.initialize()
     rows = DB.Trailers.update(watched=False).where(
         DB.Trailers.watched == 1
     ).execute()
@@ -23,6 +24,7 @@ def clearDBWatchedStatus():
     xbmcgui.Dialog().ok(T(32515, 'Done'), T(32564, 'Removed watched status from {0} trailers.').format(rows))
 
 def clearDBBrokenStatus():
+    DB.initialize()
     rows = DB.Trailers.update(broken=False).where(
         DB.Trailers.broken == 1
     ).execute()
@@ -149,8 +151,10 @@ def deleteUserKey():
 
 def removeContentDatabase():
     dbFile = os.path.join(kodiutil.PROFILE_PATH, 'content.db')
-    if os.path.exists(dbFile):
-        os.remove(dbFile)
+    for path in (dbFile, dbFile + '-wal', dbFile + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+    DB.markChanged()
 
     kodiutil.setSetting('content.initialized', False)
     xbmcgui.Dialog().ok(T(32515, 'Done'), T(32584, 'Database reset.'))
@@ -0,0 +1,14 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+try:
+    import xbmc  # noqa: F401
+except ImportError:  # Outside Kodi - use the fakes
+    sys.path.insert(0, os.path.join(ROOT, 'tests', 'fakes'))
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'slow: benchmarks over large inputs (deselect with -m "not slow")')
@@ -0,0 +1,92 @@
+"""
+Minimal stand-in for Kodi's xbmc module, enough to import the addon outside Kodi.
+Every wait that goes through Kodi is counted in KODI_WAITS.
+"""
+import time
+
+LOGDEBUG, LOGINFO, LOGWARNING, LOGERROR = 0, 1, 2, 3
+LOGNOTICE = LOGINFO
+ISO_639_1 = 0
+PLAYLIST_MUSIC, PLAYLIST_VIDEO = 0, 1
+
+KODI_WAITS = []
+
+
+def log(msg, level=LOGDEBUG):
+    pass
+
+
+def sleep(ms):
+    KODI_WAITS.append(ms / 1000.0)
+    time.sleep(ms / 1000.0)
+
+
+def translatePath(path):
+    return path
+
+
+def getLanguage(format=None, region=False):
+    return 'en-US'
+
+
+def getInfoLabel(label):
+    return ''
+
+
+def getCondVisibility(condition):
+    return False
+
+
+def getSkinDir():
+    return 'skin.estuary'
+
+
+def getSupportedMedia(media):
+    return {'video': '.mp4|.mkv|.avi', 'music': '.mp3|.flac'}.get(media, '.jpg|.png')
+
+
+def executebuiltin(function, wait=False):
+    pass
+
+
+def executeJSONRPC(request):
+    return '{}'
+
+
+class Monitor(object):
+    def abortRequested(self):
+        return False
+
+    def waitForAbort(self, timeout=0):
+        KODI_WAITS.append(timeout)
+        time.sleep(timeout or 0)
+        return False
+
+
+class Player(object):
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def isPlaying(self):
+        return False
+
+    def isPlayingVideo(self):
+        return False
+
+
+class PlayList(object):
+    def __init__(self, playlist):
+        self.items = []
+
+    def clear(self):
+        self.items = []
+
+    def add(self, url, listitem=None, index=-1):
+        self.items.append(url)
+
+    def size(self):
+        return len(self.items)
+
+
+class Keyboard(object):
+    pass
@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+PROFILE = tempfile.mkdtemp(prefix='preshow-profile-')
+PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class Addon(object):
+    settings = {}
+    edits = {}  # Applied by openSettings(), as if the user changed them in the dialog
+
+    def __init__(self, id=None):
+        pass
+
+    def getSetting(self, key):
+        return self.settings.get(key, '')
+
+    def setSetting(self, key, value):
+        self.settings[key] = value
+
+    def openSettings(self):
+        self.settings.update(self.edits)
+
+    def getAddonInfo(self, key):
+        return {
+            'id': 'script.preshowexperience',
+            'name': 'PreShow Experience',
+            'version': '0.0.0',
+            'path': PATH,
+            'profile': PROFILE
+        }.get(key, '')
+
+    def getLocalizedString(self, id):
+        return str(id)
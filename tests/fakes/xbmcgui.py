@@ -0,0 +1,56 @@
+ACTION_MOVE_LEFT = 1
+ACTION_MOVE_RIGHT = 2
+ACTION_MOVE_UP = 3
+ACTION_MOVE_DOWN = 4
+ACTION_PREVIOUS_MENU = 10
+ACTION_NAV_BACK = 92
+
+
+class Window(object):
+    def __init__(self, *args, **kwargs):
+        self._properties = {}
+
+    def getProperty(self, key):
+        return self._properties.get(key, '')
+
+    def setProperty(self, key, value):
+        self._properties[key] = value
+
+    def clearProperty(self, key):
+        self._properties.pop(key, None)
+
+
+class WindowXML(Window):
+    pass
+
+
+class WindowXMLDialog(WindowXML):
+    pass
+
+
+class Dialog(object):
+    def ok(self, *args):
+        return True
+
+    def yesno(self, *args, **kwargs):
+        return False
+
+    def notification(self, *args, **kwargs):
+        pass
+
+
+class DialogProgress(object):
+    pass
+
+
+class DialogProgressBG(object):
+    pass
+
+
+class ListItem(object):
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class ControlImage(object):
+    pass
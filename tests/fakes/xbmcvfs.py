@@ -0,0 +1,91 @@
+import os
+import shutil
+
+
+def translatePath(path):
+    return path
+
+
+def exists(path):
+    return os.path.exists(path)
+
+
+def listdir(path):
+    names = os.listdir(path)
+    dirs = [n for n in names if os.path.isdir(os.path.join(path, n))]
+    return dirs, [n for n in names if n not in dirs]
+
+
+def mkdir(path):
+    os.mkdir(path)
+    return True
+
+
+def mkdirs(path):
+    os.makedirs(path, exist_ok=True)
+    return True
+
+
+def delete(path):
+    os.remove(path)
+    return True
+
+
+def rename(src, dst):
+    os.rename(src, dst)
+    return True
+
+
+def copy(src, dst):
+    shutil.copy(src, dst)
+    return True
+
+
+class File(object):
+    # Kodi opens the file on construction, so subclasses can call File.__init__(self) without arguments
+    def __new__(cls, path, mode='r'):
+        self = object.__new__(cls)
+        self._file = open(path, 'rb' if mode == 'r' else 'wb')
+        return self
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def size(self):
+        return os.fstat(self._file.fileno()).st_size
+
+    def read(self, numBytes=0):
+        return self._file.read(numBytes or -1).decode('utf-8')
+
+    def readBytes(self, numBytes=0):
+        return bytearray(self._file.read(numBytes or -1))
+
+    def write(self, data):
+        self._file.write(data if isinstance(data, (bytes, bytearray)) else data.encode('utf-8'))
+        return True
+
+    def seek(self, offset, whence=0):
+        return self._file.seek(offset, whence)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class Stat(object):
+    def __init__(self, path):
+        self._stat = os.stat(path)
+
+    def st_mtime(self):
+        return self._stat.st_mtime
+
+    def st_size(self):
+        return self._stat.st_size
+
+    def st_mode(self):
+        return self._stat.st_mode
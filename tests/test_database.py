@@ -0,0 +1,178 @@
+import datetime
+import random
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from resources.lib.preshowexperience import database as DB
+from resources.lib.preshowexperience import util
+
+
+@pytest.fixture(autouse=True)
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(util, 'STORAGE_PATH', str(tmp_path))
+    DB.initialize(str(tmp_path))
+
+
+def test_markChanged_waits_for_commit():
+    seen = []
+
+    @DB.session
+    def scan():
+        DB.markChanged('bumpers')
+        seen.append(DB.changeCounter('bumpers'))
+
+    scan()
+
+    assert seen == [0]
+    assert DB.changeCounter('bumpers') == 1
+
+
+def test_markChanged_dropped_on_rollback():
+    @DB.session
+    def scan():
+        DB.markChanged('bumpers')
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        scan()
+
+    assert DB.changeCounter('bumpers') == 0
+    DB.markChanged('bumpers')
+    assert DB.changeCounter('bumpers') == 1
+
+
+def test_bumperCatalog_follows_committed_bumpers():
+    assert DB.bumperCatalog().audioFormatBumper('DTS') is None
+
+    @DB.session
+    def scan():
+        DB.AudioFormatBumpers.create(path='/b/dts.mp4', format='DTS', name='dts', isImage=False)
+        DB.markChanged('bumpers')
+
+    scan()
+
+    assert DB.bumperCatalog().audioFormatBumper('DTS') == '/b/dts.mp4'
+
+
+def trailer(i):
+    return dict(
+        WID='test:{0}'.format(i), source='test', watched=False, title='Trailer {0}'.format(i), url='', userAgent='',
+        rating='MPAA:PG', genres='', thumb='', release=datetime.date(2000, 1, 1)
+    )
+
+
+def test_snapshot_threads_read_while_others_write():
+    with DB.DB.atomic():
+        for i in range(20):
+            DB.Trailers.create(**trailer(i))
+
+    DB.pinSnapshot()
+    errors = []
+
+    def run(func):
+        def inner():
+            try:
+                DB.session(func)()
+            except Exception as e:
+                errors.append(e)
+        return threading.Thread(target=inner)
+
+    def read():
+        for _ in range(10):
+            for t in DB.Trailers.select():
+                time.sleep(0.0001)
+
+    def update(start):
+        def inner():
+            for t in list(DB.Trailers.select().where(DB.Trailers.id.in_(list(range(start + 1, 21, 2))))):
+                DB.writeQueue().update(DB.Trailers, DB.Trailers.WID, t.WID, watched=True)
+                time.sleep(0.001)
+        return inner
+
+    def insert(start):
+        def inner():
+            for i in range(start, start + 10):
+                DB.createRow(DB.Trailers, **trailer(i))
+                time.sleep(0.001)
+        return inner
+
+    try:
+        threads = [run(read) for _ in range(3)] + [run(update(0)), run(update(1)), run(insert(100)), run(insert(200))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert DB.Trailers.select().count() == 40
+        assert DB.Trailers.select().where(DB.Trailers.watched == False).count() == 20  # noqa: E712
+    finally:
+        DB.releaseSnapshot()
+
+    DB.flushWrites()
+    assert DB.Trailers.select().count() == 40
+    assert DB.Trailers.select().where(DB.Trailers.watched == True).count() == 20  # noqa: E712
+
+
+def sampledTrailers(count, matching):
+    with DB.DB.atomic():
+        for i in range(count):
+            DB.Trailers.create(**dict(trailer(i), watched=not matching(i)))
+        DB.Trailers.delete().where(DB.Trailers.id.in_(list(range(7, count + 1, 7)))).execute()  # Leave gaps in the keys
+
+    return set(t.id for t in DB.Trailers.select().where(DB.Trailers.watched == False))  # noqa: E712
+
+
+@pytest.mark.parametrize('matching', [lambda i: i % 2, lambda i: i % 40 == 1], ids=['dense', 'sparse'])
+def test_randomSampler_yields_filtered_rows_once(matching):
+    expected = sampledTrailers(400, matching)
+
+    rows = list(DB.RandomSampler(DB.Trailers, DB.Trailers.watched == False))  # noqa: E712
+
+    assert len(rows) == len(expected)
+    assert set(t.id for t in rows) == expected
+
+
+@pytest.mark.parametrize('matching', [lambda i: i % 2, lambda i: i % 4 == 1], ids=['dense', 'sparse'])
+def test_randomSampler_draws_uniformly(matching):
+    random.seed(5)
+    expected = sampledTrailers(80, matching)
+    sampler = DB.RandomSampler(DB.Trailers, DB.Trailers.watched == False)  # noqa: E712
+    draws = 50 * len(expected)
+
+    counts = dict.fromkeys(expected, 0)
+    for _ in range(draws):
+        counts[sampler.sample(1)[0].id] += 1
+
+    # Chi-squared against a uniform draw, twice its mean of len(expected) - 1
+    mean = float(draws) / len(expected)
+    assert sum((c - mean) ** 2 / mean for c in counts.values()) < 2 * len(expected)
+
+
+def test_maintain_skips_migration_while_busy(tmp_path, monkeypatch):
+    monkeypatch.setattr(DB, 'MAINTENANCE_BUSY_TIMEOUT', 0.1)
+    path = str(tmp_path / 'content.db')
+
+    def autoVacuum():
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+        finally:
+            conn.close()
+
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute('BEGIN IMMEDIATE')
+    try:
+        DB.maintain(str(tmp_path))
+    finally:
+        other.execute('ROLLBACK')
+        other.close()
+
+    assert autoVacuum() == 0
+
+    DB.maintain(str(tmp_path))
+
+    assert autoVacuum() == 2
@@ -0,0 +1,109 @@
+import collections
+import threading
+import time
+
+import pytest
+import xbmc
+
+pytest.importorskip('requests')
+pytest.importorskip('bs4')
+
+from resources.lib import experience  # noqa: E402
+
+
+@pytest.fixture
+def kodiWaits():
+    del xbmc.KODI_WAITS[:]
+    return xbmc.KODI_WAITS
+
+
+@pytest.fixture
+def player():
+    player = experience.ExperiencePlayer()
+    player._steps = collections.deque()
+    return player
+
+
+def later(delay, func):
+    timer = threading.Timer(delay, func)
+    timer.start()
+    return timer
+
+
+def test_waitForStep_waits_through_kodi(player, kodiWaits):
+    start = time.time()
+    assert not player.waitForStep(0.3)
+
+    assert time.time() - start >= 0.3
+    assert len(kodiWaits) >= 3
+    assert max(kodiWaits) <= player.STEP_INTERVAL
+
+
+def test_waitForStep_returns_for_queued_step(player, kodiWaits):
+    later(0.15, lambda: player._steps.append(False))
+
+    start = time.time()
+    assert not player.waitForStep(5)
+
+    assert time.time() - start < 0.5
+    assert kodiWaits
+
+
+@pytest.fixture
+def kodiCallbacks(monkeypatch):
+    """
+    Callbacks queued here run only inside a Kodi wait, as Kodi delivers player callbacks.
+    """
+    callbacks = []
+    waitForAbort = xbmc.Monitor.waitForAbort
+
+    def deliver(self, timeout=0):
+        while callbacks:
+            callbacks.pop(0)()
+        return waitForAbort(self, timeout)
+
+    monkeypatch.setattr(xbmc.Monitor, 'waitForAbort', deliver)
+    return callbacks
+
+
+def test_signal_waits_through_kodi(kodiWaits):
+    signal = experience.PlaybackSignal()
+
+    start = time.time()
+    assert not signal.wait(0.3)
+
+    assert time.time() - start >= 0.3
+    assert len(kodiWaits) >= 3
+    assert max(kodiWaits) <= signal.POLL_INTERVAL
+
+
+def test_signal_wait_returns_when_notified(kodiWaits):
+    signal = experience.PlaybackSignal()
+    later(0.15, signal.notify)
+
+    start = time.time()
+    assert not signal.wait()
+
+    assert time.time() - start < 0.5
+    assert not signal.waitUntil(time.time() + 0.05)  # Already seen - waits again
+
+
+def test_waitForPlayStop_gets_player_callbacks(player, kodiCallbacks):
+    state = {'playing': True}
+
+    def onPlayBackStopped():
+        state['playing'] = False
+        player.signal.notify()
+
+    player.signal = experience.PlaybackSignal()
+    player.abortFlag = threading.Event()
+    player.isPlaying = lambda: state['playing']
+    later(0.15, lambda: kodiCallbacks.append(onPlayBackStopped))
+
+    waiter = threading.Thread(target=player.waitForPlayStop)
+    waiter.start()
+    waiter.join(3)
+    player.abortFlag.set()
+
+    assert not waiter.is_alive(), 'waitForPlayStop never returned to Kodi to get the stop callback'
+    assert not state['playing']
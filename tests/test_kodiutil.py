@@ -0,0 +1,53 @@
+import pytest
+
+from resources.lib import kodiutil
+from resources.lib.preshowexperience import util
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    settings = {}
+    monkeypatch.setattr(kodiutil.ADDON, 'settings', settings)
+    kodiutil.clearSettingsCache()
+    yield settings
+    kodiutil.clearSettingsCache()
+
+
+def test_settings_are_cached_until_changed(settings):
+    settings['trailer.count'] = '2'
+    assert kodiutil.getSetting('trailer.count', 0) == 2
+
+    settings['trailer.count'] = '3'
+    assert kodiutil.getSetting('trailer.count', 0) == 2
+
+    kodiutil._SETTINGS_MONITOR.onSettingsChanged()
+    assert kodiutil.getSetting('trailer.count', 0) == 3
+
+
+def test_setSetting_invalidates(settings):
+    assert kodiutil.getSetting('debug.log', False) is False
+    kodiutil.setSetting('debug.log', True)
+    assert settings['debug.log'] == 'true'
+    assert kodiutil.getSetting('debug.log', False) is True
+
+
+def test_util_reads_through_kodiutil_cache(settings):
+    settings['trailer.order'] = '1'
+    settings['scraper.trailers.IMDB'] = 'false'
+    assert util.getSettingDefault('trailer.order') == 'random'
+    assert ('trailers', 'IMDB') not in util.contentScrapers()
+
+    kodiutil.setSetting('trailer.order', '0')
+    kodiutil.setSetting('scraper.trailers.IMDB', True)
+    assert util.getSettingDefault('trailer.order') == 'newest'
+    assert ('trailers', 'IMDB') in util.contentScrapers()
+
+
+def test_openSettings_invalidates(settings, monkeypatch):
+    settings['content.path'] = '/old'
+    assert kodiutil.getSetting('content.path') == '/old'
+
+    monkeypatch.setattr(kodiutil.ADDON, 'edits', {'content.path': '/new'})
+    kodiutil.openSettings()
+
+    assert kodiutil.getSetting('content.path') == '/new'
@@ -0,0 +1,107 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip('requests')
+
+from resources.lib import preshowutil  # noqa: E402
+
+
+@pytest.fixture
+def parser():
+    return preshowutil.RatingParser()
+
+
+PRECEDENCE_CASES = [
+    ('UK:15', 'MPAA', 'BBFC:15'),  # System specific patterns come first...
+    ('FSK 16', 'MPAA', 'FSK:16'),
+    ('Germany:Unrated', 'MPAA', 'FSK:Unrated'),
+    ('14 Anos', 'MPAA', 'DEJUS:14 Anos'),
+    ('Rated PG-13', 'MPAA', 'MPAA:PG-13'),  # ...then the default system, after stripping 'Rated'...
+    ('Rated 15', 'BBFC', 'BBFC:15'),
+    ('Rated 15', 'MPAA', '15'),  # ...then any system, without the system name...
+    ('TV-MA', 'MPAA', 'TV-MA'),  # ...and finally the cleaned up string itself
+    ('Not Rated', None, 'NOT')
+]
+
+
+@pytest.mark.parametrize('rating, default, expected', PRECEDENCE_CASES)
+def test_recognize_precedence(parser, rating, default, expected):
+    assert parser._recognize(rating, default) == expected
+
+
+def test_recognize_xml_system_patterns(monkeypatch):
+    def getRegExs(context=None):
+        if context == 'kodi':
+            return {'XYZ': r'(?i)^Custom(?:\s+|:)(?P<rating>A|B)'}
+        return {'XYZ': r'(?i)(?P<rating>XA|XB)'}
+
+    monkeypatch.setattr(preshowutil.preshowexperience.ratings, 'getRegExs', getRegExs)
+    parser = preshowutil.RatingParser()
+
+    assert parser._recognize('custom b', 'MPAA') == 'XYZ:b'
+    assert parser._recognize('UK:15', 'MPAA') == 'BBFC:15'  # Built in systems keep their precedence
+    assert parser._recognize('Rated XB', 'XYZ') == 'XYZ:XB'
+    assert parser._recognize('Rated XB', 'MPAA') == 'XB'
+
+
+@pytest.mark.slow
+def test_getActualRatingFromMPAA_benchmark(parser):
+    default = preshowutil.preshowexperience.ratings.DEFAULT_RATING_SYSTEM
+    samples = [c[0] for c in PRECEDENCE_CASES]
+    strings = [samples[i % len(samples)] for i in range(100000)]
+
+    start = time.time()
+    expected = [parser._recognize(r, default) for r in strings]
+    uncached = time.time() - start
+
+    start = time.time()
+    parsed = [parser.getActualRatingFromMPAA(r) for r in strings]
+    cached = time.time() - start
+
+    assert parsed == expected
+    assert set(parser._cache) == set((r, default) for r in samples)
+    assert cached < uncached
+    assert uncached < 5
+
+
+def test_getActualRatingFromMPAA_caches_per_default_system(parser, monkeypatch):
+    monkeypatch.setattr(preshowutil.preshowexperience.ratings, 'DEFAULT_RATING_SYSTEM', 'BBFC')
+    assert parser.getActualRatingFromMPAA('Rated 15') == 'BBFC:15'
+
+    monkeypatch.setattr(preshowutil.preshowexperience.ratings, 'DEFAULT_RATING_SYSTEM', 'MPAA')
+    assert parser.getActualRatingFromMPAA('Rated 15') == '15'
+    assert set(parser._cache) == {('Rated 15', 'BBFC'), ('Rated 15', 'MPAA')}
+
+
+def test_getActualRatingFromMPAA_empty(parser):
+    assert parser.getActualRatingFromMPAA('') == 'UNKNOWN:NR'
+
+
+def test_getSequenceIndex_skips_save_leftovers(tmp_path, monkeypatch):
+    monkeypatch.setattr(preshowutil.kodiutil, 'PROFILE_PATH', str(tmp_path))
+    monkeypatch.setattr(preshowutil, '_SEQUENCE_INDEX', None)
+    sequences = tmp_path / 'Sequences'
+    sequences.mkdir()
+    data = preshowutil.preshowexperience.sequence.SequenceData()
+    data.name = 'Test'
+    data.save(str(sequences / 'Test.seq'))
+    (sequences / 'Test.seq.tmp').write_text('{')
+    (sequences / 'Test.seq.bak').write_text('{')
+
+    index = preshowutil.getSequenceIndex(str(sequences))
+
+    assert [(os.path.basename(p), s.name) for p, s in index] == [('Test.seq', 'Test')]
+
+
+def test_getMatchedSequence_leaves_index_entry_unnamed(tmp_path, monkeypatch):
+    data = preshowutil.preshowexperience.sequence.SequenceData(path_name='Test.seq')
+    data.name = ''
+    monkeypatch.setattr(preshowutil, 'getSequencesContentPath', lambda: str(tmp_path))
+    monkeypatch.setattr(preshowutil, 'getActiveSequences', lambda: [data])
+
+    matched = preshowutil.getMatchedSequence(object())
+
+    assert matched['sequence'].name == 'default'
+    assert data.name == ''
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from resources.lib.preshowexperience import database as DB
+from resources.lib.preshowexperience import ratings
+from resources.lib.preshowexperience import util
+
+
+@pytest.fixture(autouse=True)
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(util, 'STORAGE_PATH', str(tmp_path))
+    DB.initialize(str(tmp_path))
+    ratings.load()
+    monkeypatch.setattr(ratings, 'DEFAULT_RATING_SYSTEM', 'MPAA')
+    ratings._resolveRating.cache_clear()
+
+
+@pytest.mark.parametrize('string, expected', [
+    ('MPAA:PG-13', 'MPAA:PG-13'),
+    ('MPAA:R', 'MPAA:R'),
+    ('PG', 'MPAA:PG'),
+    ('nc-17', 'MPAA:NC-17'),
+    ('BBFC:12A', 'BBFC:12A'),
+    ('BBFC:u', 'BBFC:U'),
+    ('FSK:16', 'FSK:16'),
+    ('fsk:0', 'FSK:0'),
+    ('DEJUS:14 Anos', 'DEJUS:14 Anos'),
+    ('DEJUS:Livre', 'DEJUS:Livre'),
+    ('UNKNOWN:NR', 'Unknown'),
+    ('Rated X', 'Unknown'),
+    ('', 'Unknown')
+])
+def test_getRating(string, expected):
+    assert str(ratings.getRating(string)) == expected
+
+
+def test_getRating_system_and_name():
+    assert str(ratings.getRating('bbfc', '15')) == 'BBFC:15'
+
+
+def test_getRating_memoized_matches_unmemoized():
+    for string in ('MPAA:PG-13', 'PG', 'BBFC:12A', 'fsk:0', 'UNKNOWN:NR'):
+        expected = ratings._resolveRating.__wrapped__(string, None, ratings.DEFAULT_RATING_SYSTEM)
+        assert ratings.getRating(string) is expected
+        assert ratings.getRating(string) is expected
+
+    assert ratings._resolveRating.cache_info().hits == 5
+
+
+def test_getRating_follows_default_system(monkeypatch):
+    monkeypatch.setattr(ratings, 'DEFAULT_RATING_SYSTEM', 'FSK')
+    assert str(ratings.getRating('16')) == 'FSK:16'
+
+
+def test_added_rating_clears_memo(monkeypatch):
+    monkeypatch.setitem(ratings.RATINGS_SYSTEMS, 'MPAA', ratings.MPAA())
+    assert not ratings.getRating('MPAA:TEST')
+    ratings.getRatingsSystem('MPAA').addRating(ratings.Rating('TEST', 500))
+    assert str(ratings.getRating('MPAA:TEST')) == 'MPAA:TEST'
+
+
+@pytest.mark.slow
+def test_getRating_benchmark():
+    samples = [
+        'MPAA:PG-13', 'MPAA:R', 'PG', 'nc-17', 'BBFC:12A', 'BBFC:u', 'FSK:16', 'fsk:0',
+        'DEJUS:14 Anos', 'DEJUS:Livre', 'UNKNOWN:NR', 'Rated X'
+    ]
+    strings = [samples[i % len(samples)] for i in range(100000)]
+
+    start = time.time()
+    expected = [ratings._resolveRating.__wrapped__(s, None, ratings.DEFAULT_RATING_SYSTEM) for s in strings]
+    unmemoized = time.time() - start
+
+    start = time.time()
+    resolved = [ratings.getRating(s) for s in strings]
+    memoized = time.time() - start
+
+    assert all(r is e for r, e in zip(resolved, expected))
+    info = ratings._resolveRating.cache_info()
+    assert (info.misses, info.hits) == (len(samples), len(strings) - len(samples))
+    assert memoized < unmemoized
+    assert memoized < 1
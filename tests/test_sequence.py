@@ -0,0 +1,182 @@
+import datetime
+import os
+import random
+
+import pytest
+
+from resources.lib.preshowexperience import exceptions
+from resources.lib.preshowexperience import ratings
+from resources.lib.preshowexperience import sequence
+from resources.lib.preshowexperience import util
+
+
+def test_writeVerified_keeps_newlines(tmp_path):
+    path = str(tmp_path / 'Test.seq')
+    data = '{\r\n "name": "Café"\n}'
+
+    assert sequence.writeVerified(path, data)
+
+    with open(path, 'rb') as f:
+        assert f.read() == data.encode('utf-8')
+    assert os.listdir(str(tmp_path)) == ['Test.seq']
+
+
+def test_writeVerified_replaces_existing(tmp_path):
+    path = str(tmp_path / 'Test.seq')
+    sequence.writeVerified(path, 'old')
+
+    assert sequence.writeVerified(path, 'new')
+
+    with open(path, 'rb') as f:
+        assert f.read() == b'new'
+
+
+@pytest.mark.parametrize('read, exception', [
+    (None, exceptions.SequenceWriteReadUnknownException),
+    ('', exceptions.SequenceWriteReadEmptyException),
+    ('other', exceptions.SequenceWriteReadBadException)
+])
+def test_writeVerified_removes_temp_on_bad_read(tmp_path, monkeypatch, read, exception):
+    class File(object):
+        def __init__(self, path, mode='r'):
+            if read is None:
+                raise IOError(path)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def read(self):
+            return read
+
+    monkeypatch.setattr(util.vfs, 'File', File)
+    path = str(tmp_path / 'Test.seq')
+
+    with pytest.raises(exception):
+        sequence.writeVerified(path, 'data')
+
+    assert os.listdir(str(tmp_path)) == []
+
+
+class Sample(sequence.Item):
+    _type = 'sample'
+    _elements = (
+        {'attr': 'count', 'type': int, 'limits': (0, 10, 1), 'name': 'Count', 'default': 0},
+        {'attr': 'speed', 'type': float, 'limits': None, 'name': 'Speed', 'default': 0.0},
+        {'attr': 'random', 'type': sequence.strToBool, 'limits': sequence.LIMIT_BOOL, 'name': 'Random', 'default': True},
+        {'attr': 'limitGenre', 'type': sequence.strToBoolWithDefault, 'limits': sequence.LIMIT_BOOL_DEFAULT, 'name': 'Genre', 'default': None}
+    )
+
+    def __init__(self):
+        sequence.Item.__init__(self)
+        self.resetToDefaults()
+
+
+@pytest.mark.parametrize('values', [
+    {'count': 3, 'speed': 1.5, 'random': True, 'limitGenre': True},
+    {'count': 7, 'speed': 0.25, 'random': False, 'limitGenre': False}
+])
+def test_item_xml_round_trip(values):
+    item = Sample()
+    for attr, value in values.items():
+        setattr(item, attr, value)
+
+    loaded = Sample._fromNode(item.toNode())
+
+    assert dict((attr, getattr(loaded, attr)) for attr in values) == values
+    assert [type(getattr(loaded, attr)) for attr in values] == [type(v) for v in values.values()]
+
+
+def test_sequence_save_load_round_trip(tmp_path):
+    trailer = sequence.Trailer()
+    trailer.count = 3
+    trailer.limitGenre = True
+    trailer.volume = 80
+    data = sequence.SequenceData()
+    data.name = 'Test'
+    data.setItems([trailer])
+    path = str(tmp_path / 'Test.seq')
+
+    assert data.save(path)
+    loaded = sequence.SequenceData.load(path)[0]
+
+    assert (loaded.count, loaded.limitGenre, loaded.volume) == (3, True, 80)
+
+    xml = '<sequence><item type="trailer" enabled="True"><count>3</count><limitGenre>True</limitGenre></item></sequence>'
+    loaded = sequence.SequenceData()._getItemsFromXMLString(xml)[0]
+    assert (loaded.count, loaded.limitGenre) == (3, True)
+
+
+class Feature(object):
+    def __init__(self, **kwargs):
+        self.title = ''
+        self.rating = None
+        self.year = ''
+        self.videoaspect = ''
+        self.studios = self.directors = self.cast = self.tags = self.genres = []
+        self.__dict__.update(kwargs)
+
+
+class FixedDatetime(datetime.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 12, 24, 20, 30)
+
+
+def matchByAttr(sequences, feature):
+    matches = []
+    for seq in sequences:
+        total = 0
+        for attr in sequence.SequenceMatcher.PRIORITY:
+            score = seq.matchesFeatureAttr(attr, feature)
+            if score < 0:
+                break
+            total += score
+        else:
+            matches.append([seq, total])
+    return matches
+
+
+def randomSequence(rand, n):
+    mpaa = [ratings.MPAA.G, ratings.MPAA.PG, ratings.MPAA.PG_13, ratings.MPAA.R, ratings.MPAA.NC_17]
+    conditions = {
+        'featuretitle': lambda: [rand.choice(['alien', 'the', 'star', 'home alone', 'x'])],
+        'ratings': lambda: [rand.choice([[rand.choice(mpaa)], [rand.choice(mpaa + [None]), rand.choice(mpaa + [None])]])],
+        'year': lambda: [rand.choice([[rand.randint(1980, 2020)], [rand.randint(1980, 2020), rand.choice([0, rand.randint(1990, 2024)])]])],
+        'dates': lambda: [rand.choice([[[12, rand.randint(20, 28)]], [[rand.randint(1, 12), 1], [12, rand.randint(1, 31)]]])],
+        'times': lambda: [rand.choice([[[rand.randint(18, 22), None]], [[rand.randint(18, 21), 0], [20, rand.randint(0, 59)]]])],
+        'genres': lambda: rand.sample(['Action', 'Comedy', 'Drama', 'Horror'], 2),
+        'studios': lambda: [rand.choice(['Warner', 'Pixar', 'Universal'])],
+        'tags': lambda: [rand.choice(['holiday', 'classic'])]
+    }
+    seq = sequence.SequenceData()
+    seq.name = 'seq{0}'.format(n)
+    for key in rand.sample(sorted(conditions), rand.randint(0, 3)):
+        seq.set(key, conditions[key]())
+    return seq
+
+
+def test_sequenceMatcher_matches_matchesFeatureAttr(monkeypatch):
+    monkeypatch.setattr(datetime, 'datetime', FixedDatetime)
+    rand = random.Random(7)
+    sequences = [randomSequence(rand, n) for n in range(200)]
+    matcher = sequence.SequenceMatcher(sequences)
+
+    features = [Feature()]
+    for title in ('Alien', 'Home Alone 2', 'Star Wars', 'Up'):
+        for rating in (None, ratings.MPAA.PG, ratings.MPAA.R):
+            features.append(Feature(
+                title=title,
+                rating=rating,
+                year=rand.randint(1985, 2024),
+                genres=rand.sample(['Action', 'Comedy', 'Drama', 'Horror'], 3),
+                studios=[rand.choice(['Warner Bros Studios', 'Pixar', 'Universal'])],
+                tags=['holiday']
+            ))
+
+    for feature in features:
+        matches = matcher.match(feature)
+        assert matches == matchByAttr(sequences, feature)
+    assert any(matcher.match(feature) for feature in features)
@@ -0,0 +1,23 @@
+import pytest
+
+from resources.lib.preshowexperience import database as DB
+from resources.lib.preshowexperience import sequenceprocessor
+from resources.lib.preshowexperience import util
+
+
+@pytest.fixture(autouse=True)
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(util, 'STORAGE_PATH', str(tmp_path))
+    DB.initialize(str(tmp_path))
+
+
+def test_failed_construction_releases_snapshot(tmp_path, monkeypatch):
+    def loadSequence(self, sequence_path):
+        raise IOError(sequence_path)
+
+    monkeypatch.setattr(sequenceprocessor.SequenceProcessor, 'loadSequence', loadSequence)
+
+    with pytest.raises(IOError):
+        sequenceprocessor.SequenceProcessor(str(tmp_path / 'Missing.seq'), db_path=str(tmp_path))
+
+    assert not isinstance(DB.DB, DB.SnapshotDatabase)